@@ -0,0 +1,6 @@
+"""Performance benchmarks for the clippings module.
+
+Run a benchmark with e.g. `python -m benchmarks.timestamps`, or the whole
+suite with `python -m benchmarks.suite`. The startup time of the command line
+is measured by `python -m benchmarks.startup`.
+"""
@@ -0,0 +1,87 @@
+"""Compare the memory used by the clipping classes against `__dict__`-based ones.
+
+The classes used to store their attributes in a per-instance `__dict__`,
+which is what the `Legacy*` classes below do.
+"""
+
+import io
+import sys
+import tracemalloc
+
+from benchmarks.synthetic import generate_clippings
+from clippings.parser import Clipping
+from clippings.parser import Document
+from clippings.parser import Location
+from clippings.parser import Metadata
+from clippings.parser import parse_clippings
+
+
+class LegacyDocument:
+    def __init__(self, title, authors=None):
+        self.title = title
+        self.authors = authors
+
+
+class LegacyLocation:
+    def __init__(self, begin, end):
+        self.begin = begin
+        self.end = end
+
+
+class LegacyMetadata:
+    def __init__(self, category, location, timestamp, page=None):
+        self.category = category
+        self.location = location
+        self.timestamp = timestamp
+        self.page = page
+
+
+class LegacyClipping:
+    def __init__(self, document, metadata, content):
+        self.document = document
+        self.metadata = metadata
+        self.content = content
+
+
+def build(clippings, document_cls, location_cls, metadata_cls, clipping_cls):
+    """Rebuild the clippings with the given classes, sharing their attribute values."""
+    return [
+        clipping_cls(
+            document_cls(clipping.document.title, clipping.document.authors),
+            metadata_cls(
+                clipping.metadata.category,
+                location_cls(clipping.metadata.location.begin, clipping.metadata.location.end),
+                clipping.metadata.timestamp,
+                clipping.metadata.page,
+            ),
+            clipping.content,
+        )
+        for clipping in clippings
+    ]
+
+
+def measure(clippings, *classes):
+    """Return the memory allocated (in bytes) to rebuild the clippings with the classes."""
+    tracemalloc.start()
+    rebuilt = build(clippings, *classes)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rebuilt
+    return size
+
+
+def main(count=100000):
+    clippings = parse_clippings(io.StringIO(generate_clippings(count)))
+
+    legacy_size = measure(
+        clippings, LegacyDocument, LegacyLocation, LegacyMetadata, LegacyClipping
+    )
+    slots_size = measure(clippings, Document, Location, Metadata, Clipping)
+    print(f"Objects for {count:,} clippings (excluding attribute values):")
+    print(f"__dict__:  {legacy_size / 2**20:8.1f} MiB")
+    print(f"__slots__: {slots_size / 2**20:8.1f} MiB")
+    print(f"Saved:     {1 - slots_size / legacy_size:8.0%}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,87 @@
+"""Measure the startup time of the command line.
+
+Time (wall clock, median of several runs) a bare interpreter, the import of
+the parser, and the command line on a small clippings file, then list the
+slowest imports as reported by `python -X importtime`, e.g.:
+
+    python -m benchmarks.startup --runs 20
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import generate_clippings
+
+DEFAULT_RUNS = 10
+DEFAULT_TOP = 10
+SMALL_FILE_ENTRIES = 10
+
+
+def measure_command(command, runs):
+    """Return the median wall clock time (in seconds) of running a command."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def slowest_imports(module, top):
+    """Return the (cumulative milliseconds, module) of the slowest imports
+    when importing a module, slowest first.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    imports = []
+    for line in process.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[1].isdigit():
+            imports.append((int(fields[1]) / 1000, fields[2]))
+    return sorted(imports, reverse=True)[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description=__doc__)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="number of imports listed")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        clippings_path = os.path.join(directory, "clippings.txt")
+        with open(clippings_path, "w", encoding="utf-8") as clippings_file:
+            clippings_file.write(generate_clippings(SMALL_FILE_ENTRIES))
+
+        commands = {
+            "python": [sys.executable, "-c", "pass"],
+            "import": [sys.executable, "-c", "import clippings.parser"],
+            "cli json": [sys.executable, "-m", "clippings.parser", clippings_path],
+            "cli kindle": [
+                sys.executable,
+                "-m",
+                "clippings.parser",
+                clippings_path,
+                "-o",
+                "kindle",
+            ],
+        }
+        for name, command in commands.items():
+            seconds = measure_command(command, args.runs)
+            print(f"{name:12} {seconds * 1000:8.1f} ms")
+
+    print("Slowest imports of clippings.parser (cumulative):")
+    for milliseconds, module in slowest_imports("clippings.parser", args.top):
+        print(f"  {milliseconds:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Benchmark suite for parsing and serialization, on synthetic clippings files.
+
+Measure the throughput and peak memory of `parse_clippings`, `as_kindle`,
+`as_json` and `as_dicts` for files of several sizes, e.g.:
+
+    python -m benchmarks.suite --sizes 1000 100000 1000000 --output results.json
+
+Results are written as JSON, and can be compared with those of a previous run
+(e.g. on another branch) with `--compare baseline.json`.
+"""
+
+import argparse
+import datetime
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import clippings
+from benchmarks.synthetic import generate_clippings
+from clippings.languages import parse_metadata
+from clippings.parser import Metadata
+from clippings.parser import as_dicts
+from clippings.parser import as_json
+from clippings.parser import as_kindle
+from clippings.parser import parse_clippings
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.1  # Relative slowdown reported as a regression
+
+
+def _parse(data, metadata_parser):
+    return lambda: parse_clippings(io.BytesIO(data), metadata_parser=metadata_parser)
+
+
+def benchmarks(data, parsed_clippings, metadata_parser):
+    """Return the functions to measure, by name."""
+    return {
+        "parse_clippings": _parse(data, metadata_parser),
+        "as_kindle": lambda: as_kindle(parsed_clippings),
+        "as_json": lambda: as_json(parsed_clippings),
+        "as_dicts": lambda: as_dicts(parsed_clippings),
+    }
+
+
+def measure_time(function, repeat):
+    """Return the best time (in seconds) of `repeat` calls to a function."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def measure_peak_memory(function):
+    """Return the peak memory (in bytes) allocated during a call to a function."""
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run(sizes, repeat=DEFAULT_REPEAT, crlf=False, multilingual=False):
+    """Run the benchmarks for files of each size, and return their results."""
+    languages = ("en", "es") if multilingual else ("en",)
+    metadata_parser = parse_metadata if multilingual else Metadata.parse
+    results = []
+    for size in sizes:
+        data = generate_clippings(size, crlf=crlf, languages=languages).encode("utf-8")
+        parsed_clippings = _parse(data, metadata_parser)()
+        for name, function in benchmarks(data, parsed_clippings, metadata_parser).items():
+            seconds = measure_time(function, repeat)
+            result = {
+                "benchmark": name,
+                "entries": size,
+                "seconds": seconds,
+                "entries_per_second": size / seconds,
+                # Of the clippings file, for serializations too
+                "megabytes_per_second": len(data) / seconds / 2**20,
+                "peak_memory": measure_peak_memory(function),
+            }
+            print(
+                f"{name:16} {size:>10,} entries: {result['entries_per_second']:>12,.0f} entries/s"
+                f" {result['megabytes_per_second']:>8.1f} MiB/s"
+                f" {result['peak_memory'] / 2**20:>9.1f} MiB peak",
+                file=sys.stderr,
+            )
+            results.append(result)
+    return {
+        "environment": {
+            "clippings": clippings.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "repeat": repeat,
+        "options": {"crlf": crlf, "multilingual": multilingual},
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Print the change of each result against a baseline, and return the
+    number of regressions: benchmarks slower than the baseline by more than
+    `threshold`.
+    """
+    if baseline.get("options") != current["options"]:
+        print(
+            "Warning: the runs have different options, so they aren't comparable", file=sys.stderr
+        )
+    baseline_results = {
+        (result["benchmark"], result["entries"]): result for result in baseline["results"]
+    }
+    regressions = 0
+    for result in current["results"]:
+        key = (result["benchmark"], result["entries"])
+        baseline_result = baseline_results.get(key)
+        if baseline_result is None:
+            continue
+        time_change = result["seconds"] / baseline_result["seconds"] - 1
+        memory_change = result["peak_memory"] / max(baseline_result["peak_memory"], 1) - 1
+        regression = time_change > threshold
+        regressions += regression
+        print(
+            f"{key[0]:16} {key[1]:>10,} entries: time {time_change:>+7.1%}"
+            f"  peak memory {memory_change:>+7.1%}{'  REGRESSION' if regression else ''}"
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__)
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="numbers of entries"
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--crlf", action="store_true", help="use CRLF line endings")
+    parser.add_argument(
+        "--multilingual", action="store_true", help="mix English and Spanish metadata"
+    )
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    current = run(args.sizes, args.repeat, args.crlf, args.multilingual)
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            json.dump(current, output_file, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(baseline, current, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Generator of synthetic clippings files, for benchmarks."""
+
+import datetime
+import random
+
+from clippings.parser import CLIPPINGS_SEPARATOR
+from clippings.parser import DATETIME_FORMAT
+from clippings.scanner import BOM
+
+WORDS = (
+    "the of and to in is that it was for on are as with his they at be this from have "
+    "or by one had not but what all were when we there can an your which their said if "
+    "will each about how up out them then she many some so these would other into has"
+).split()
+
+# Relative frequency of each category, as in a typical clippings file
+CATEGORIES = {
+    "Highlight": 8,
+    "Note": 2,
+    "Bookmark": 1,
+}
+
+PAGE_RATE = 0.5  # Fraction of the entries with a page
+BOM_RATE = 0.05  # Fraction of the entries with a BOM before their title
+LONG_NOTE_RATE = 0.1  # Fraction of the notes that are long
+
+SPANISH_CATEGORIES = {
+    "Highlight": "La subrayado",
+    "Note": "La nota",
+    "Bookmark": "El marcador",
+}
+SPANISH_MONTHS = [
+    "enero",
+    "febrero",
+    "marzo",
+    "abril",
+    "mayo",
+    "junio",
+    "julio",
+    "agosto",
+    "septiembre",
+    "octubre",
+    "noviembre",
+    "diciembre",
+]
+SPANISH_WEEKDAYS = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+
+
+def _english_metadata(category, page, location, timestamp):
+    page_str = "" if page is None else f"page {page} | "
+    timestamp_str = timestamp.strftime(DATETIME_FORMAT).replace(" 0", " ")
+    return f"- Your {category} on {page_str}Location {location} | Added on {timestamp_str}"
+
+
+def _spanish_metadata(category, page, location, timestamp):
+    page_str = "" if page is None else f"página {page} | "
+    timestamp_str = (
+        f"{SPANISH_WEEKDAYS[timestamp.weekday()]}, {timestamp.day} de "
+        f"{SPANISH_MONTHS[timestamp.month - 1]} de {timestamp.year} "
+        f"{timestamp:%H:%M:%S}"
+    )
+    return (
+        f"- {SPANISH_CATEGORIES[category]} en la {page_str}posición {location} | "
+        f"Añadido el {timestamp_str}"
+    )
+
+
+METADATA_FORMATS = {
+    "en": _english_metadata,
+    "es": _spanish_metadata,
+}
+
+
+def generate_clippings(count, seed=0, crlf=False, languages=("en",)):
+    """Return the text of a clippings file with `count` random entries.
+
+    Entries are of mixed categories (with empty bookmarks, and some long
+    notes), some with a page, and some with a BOM before their title. With
+    `crlf`, lines end with CRLF rather than LF. The metadata lines are written
+    in one of the `languages` (see `METADATA_FORMATS`), picked at random for
+    each entry: files in other languages than English must be parsed with
+    `clippings.languages.parse_metadata`.
+
+    The output only depends on the arguments.
+    """
+    rng = random.Random(seed)
+    documents = [
+        (f"Book {number}", f"Author {rng.randrange(count // 10 + 1)}")
+        for number in range(count // 20 + 1)
+    ]
+    categories = list(CATEGORIES)
+    category_weights = list(CATEGORIES.values())
+    metadata_formats = [METADATA_FORMATS[language] for language in languages]
+    newline = "\r\n" if crlf else "\n"
+    timestamp = datetime.datetime(2016, 1, 1)
+    entries = []
+    for _ in range(count):
+        title, authors = rng.choice(documents)
+        category = rng.choices(categories, category_weights)[0]
+        begin = rng.randrange(1, 10000)
+        if category == "Highlight":
+            location = f"{begin}-{begin + rng.randrange(0, 5)}"
+        else:
+            location = str(begin)
+        page = rng.randrange(1, 500) if rng.random() < PAGE_RATE else None
+        timestamp += datetime.timedelta(seconds=rng.randrange(1, 100000))
+        metadata = rng.choice(metadata_formats)(category, page, location, timestamp)
+
+        if category == "Bookmark":
+            content = ""
+        elif category == "Note" and rng.random() < LONG_NOTE_RATE:
+            paragraphs = (
+                " ".join(rng.choice(WORDS) for _ in range(rng.randrange(50, 200)))
+                for _ in range(rng.randrange(2, 6))
+            )
+            content = newline.join(paragraphs)
+        else:
+            content = " ".join(rng.choice(WORDS) for _ in range(rng.randrange(5, 60)))
+
+        bom = BOM if rng.random() < BOM_RATE else ""
+        entries.append(
+            newline.join(
+                [f"{bom}{title} ({authors})", metadata, "", content, CLIPPINGS_SEPARATOR, ""]
+            )
+        )
+    return "".join(entries)
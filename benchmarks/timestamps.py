@@ -0,0 +1,42 @@
+"""Compare the fast timestamp parser against `dateutil.parser.parse`."""
+
+import timeit
+
+import dateutil.parser
+
+from clippings.timestamps import parse_timestamp
+
+TIMESTAMPS = [
+    "Monday, March 21, 2016 8:35:16 AM",
+    "Thursday, July 14, 2016 11:35:52 PM",
+    "Tuesday, August 16, 2016 6:02:10 PM",
+    "Tuesday, September 13, 2016 7:29:09 AM",
+    "Tuesday, September 13, 2016 7:31:45 AM",
+    "Friday, May 13, 2016 23:23:26",
+    "Wednesday, 6 July 2022 06:54:57",
+]
+
+NUMBER = 2000
+
+
+def bench(function):
+    """Return the number of timestamps parsed per second by `function`."""
+
+    def run():
+        for timestamp in TIMESTAMPS:
+            function(timestamp)
+
+    seconds = min(timeit.repeat(run, number=NUMBER, repeat=5))
+    return NUMBER * len(TIMESTAMPS) / seconds
+
+
+def main():
+    dateutil_rate = bench(dateutil.parser.parse)
+    fast_rate = bench(parse_timestamp)
+    print(f"dateutil.parser.parse: {dateutil_rate:12,.0f} timestamps/s")
+    print(f"parse_timestamp:       {fast_rate:12,.0f} timestamps/s")
+    print(f"Speedup:               {fast_rate / dateutil_rate:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
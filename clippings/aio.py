@@ -0,0 +1,75 @@
+"""Asynchronous parsing of clippings, from async streams.
+
+Entries are split from the stream on the event loop as chunks arrive, and
+parsed in batches in an executor, so that parsing doesn't block the loop.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Callable
+
+from clippings import scanner
+from clippings.parser import CHUNK_SIZE
+from clippings.parser import CLIPPINGS_SEPARATOR
+from clippings.parser import CLIPPINGS_SEPARATOR_BYTES
+from clippings.parser import Document
+from clippings.parser import Metadata
+from clippings.parser import _parse_entries
+
+
+async def _aiter_chunks(stream, chunk_size):
+    """Yield the chunks of an async stream: one with an async `read()` method
+    (e.g. `asyncio.StreamReader`), or an async iterable of chunks.
+    """
+    if hasattr(stream, "read"):
+        while True:
+            chunk = await stream.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        async for chunk in stream:
+            yield chunk
+
+
+async def _aiter_entry_batches(stream, chunk_size):
+    """Yield the lists of entries completed by each chunk of an async stream.
+
+    Content following the last separator is not a complete entry, and is
+    ignored.
+    """
+    splitter = None
+    async for chunk in _aiter_chunks(stream, chunk_size):
+        if splitter is None:
+            splitter = scanner.EntrySplitter(
+                CLIPPINGS_SEPARATOR_BYTES if isinstance(chunk, bytes) else CLIPPINGS_SEPARATOR
+            )
+        entries = splitter.feed(chunk)
+        if entries:
+            yield [entry for _, entry in entries]
+
+
+async def aparse_clippings(
+    stream,
+    document_parser: Callable[[str], Document] = Document.parse,
+    metadata_parser: Callable[[str], Metadata] = Metadata.parse,
+    executor: Executor = None,
+    chunk_size: int = CHUNK_SIZE,
+):
+    """Asynchronously yield the clippings of an async stream of bytes or text.
+
+    The stream is either an object with an async `read(n)` method (e.g. an
+    `asyncio.StreamReader`), or an async iterable of chunks. Clippings are
+    yielded in their original order, as the entries of each chunk are parsed.
+
+    Entries are parsed in `executor` (by default, the loop's default
+    executor), so that other tasks can run meanwhile. With a process pool, the parsers
+    must be picklable, i.e. defined at the top level of a module.
+    """
+    loop = asyncio.get_running_loop()
+    async for entries in _aiter_entry_batches(stream, chunk_size):
+        clippings = await loop.run_in_executor(
+            executor, _parse_entries, entries, document_parser, metadata_parser
+        )
+        for clipping in clippings:
+            yield clipping
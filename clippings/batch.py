@@ -0,0 +1,352 @@
+"""Parsing of many clippings files at once, e.g. a tree of uploaded files.
+
+Files are parsed concurrently in a pool of processes. The clippings are either
+written as one stream, each tagged with the file it comes from, or to one
+output file per input file:
+
+    clippings batch ./uploads -w ./clippings.jsonl
+    clippings batch './uploads/**/*.txt' --output-dir ./parsed -o kindle
+"""
+
+import argparse
+import fnmatch
+import glob
+import os
+import shutil
+import sys
+import tempfile
+from itertools import repeat
+from json.encoder import encode_basestring_ascii
+from time import perf_counter
+
+from clippings.parser import ERRORS
+from clippings.parser import WRITE_FUNCTIONS
+from clippings.parser import iter_clippings
+from clippings.parser import write_jsonl
+
+DEFAULT_PATTERN = "*.txt"  # Files searched for in directories
+EXTENSIONS = {
+    "json": ".json",
+    "jsonl": ".jsonl",
+    "kindle": ".txt",
+}
+
+
+def find_clippings_files(paths, pattern=DEFAULT_PATTERN):
+    """Return the clippings files designated by paths, in order and without
+    duplicates.
+
+    Each path is a file, a directory (searched recursively for the files
+    matching `pattern`) or, if no such path exists, a glob pattern, which can
+    use `**`. Paths that don't exist raise `FileNotFoundError`.
+    """
+    files = {}  # Ordered set
+    for path in paths:
+        # Existing paths are taken as is, even if they look like a glob pattern
+        if os.path.exists(path) or glob.escape(path) == path:
+            matches = [path]
+        else:
+            matches = sorted(glob.glob(path, recursive=True))
+            if not matches:
+                raise FileNotFoundError(f"No files match {path!r}")
+        for match in matches:
+            if os.path.isdir(match):
+                for directory, subdirectories, file_names in os.walk(match):
+                    subdirectories.sort()
+                    for file_name in sorted(fnmatch.filter(file_names, pattern)):
+                        files[os.path.normpath(os.path.join(directory, file_name))] = None
+            elif os.path.exists(match):
+                files[os.path.normpath(match)] = None
+            else:
+                raise FileNotFoundError(f"No such file or directory: {match!r}")
+    return list(files)
+
+
+def output_paths(paths, output_dir, output="jsonl"):
+    """Return the path of the output file of each clippings file, in
+    `output_dir`.
+
+    The tree of the clippings files, from their closest common directory, is
+    kept, so that files with the same name in different directories (e.g.
+    per-user uploads) don't overwrite each other.
+    """
+    if not paths:
+        return []
+    absolute_paths = [os.path.abspath(path) for path in paths]
+    root = os.path.commonpath([os.path.dirname(path) for path in absolute_paths])
+    return [
+        os.path.join(
+            output_dir, os.path.splitext(os.path.relpath(path, root))[0] + EXTENSIONS[output]
+        )
+        for path in absolute_paths
+    ]
+
+
+class FileResult:
+    """Result of parsing one clippings file.
+
+    - `path`: the path of the clippings file;
+    - `clippings`: the number of clippings parsed;
+    - `destination`: the output file, or None if the clippings were written
+      to the combined stream;
+    - `failures`: the `EntryFailure` of the entries that couldn't be parsed,
+      with `errors="collect"`;
+    - `error`: the error that prevented parsing the file, if any. Nothing is
+      written then.
+    """
+
+    __slots__ = ("path", "clippings", "destination", "failures", "error")
+
+    def __init__(self, path, clippings=0, destination=None, failures=(), error=None):
+        self.path = path
+        self.clippings = clippings
+        self.destination = destination
+        self.failures = list(failures)
+        self.error = error
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.path}: {self.clippings} clippings>"
+
+
+class _CountingIterator:
+    """Iterator over the clippings of a file, counting them."""
+
+    def __init__(self, clippings):
+        self._clippings = clippings
+        self.count = 0
+
+    def __iter__(self):
+        for clipping in self._clippings:
+            self.count += 1
+            yield clipping
+
+
+class _TaggedWriter:
+    """File object writing JSON Lines to another one, each object starting
+    with the "file" it comes from.
+    """
+
+    def __init__(self, fp, path):
+        self._fp = fp
+        self._prefix = f'{{"file": {encode_basestring_ascii(path)}, '
+
+    def write(self, text):
+        # Only whole lines are written, and the objects are ASCII-encoded, so
+        # the only line breaks are the ends of lines
+        self._fp.write("".join(self._prefix + line[1:] for line in text.splitlines(True)))
+
+
+def _process_file(path, destination, output, errors, tagged=False):
+    """Parse a clippings file, and write its clippings to the destination,
+    as tagged JSON Lines if `tagged`.
+
+    Runs in the worker processes, so that only counters go back to the main
+    process, rather than the clippings.
+    """
+    failures = [] if errors == "collect" else None
+    try:
+        with open(path, "rb") as clippings_file:
+            clippings = _CountingIterator(
+                iter_clippings(clippings_file, errors=errors, failures=failures)
+            )
+            os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+            with open(destination, "w", encoding="utf-8") as output_file:
+                try:
+                    if tagged:
+                        write_jsonl(clippings, _TaggedWriter(output_file, path))
+                    else:
+                        WRITE_FUNCTIONS[output](clippings, output_file)
+                except BaseException:
+                    # Don't leave a partial output behind
+                    output_file.close()
+                    os.remove(destination)
+                    raise
+    except Exception as exception:  # Any error only fails this file
+        return FileResult(
+            path, destination=destination, error=f"{type(exception).__name__}: {exception}"
+        )
+    return FileResult(path, clippings.count, destination, failures or ())
+
+
+def _copy_tagged(result, write_to, output, separator):
+    """Copy the tagged JSON Lines of a result to the combined stream, as JSON
+    Lines or as items of a JSON array, then remove them.
+
+    Return the separator of the next JSON array items.
+    """
+    with open(result.destination, encoding="utf-8") as tagged_file:
+        if output == "json":
+            for line in tagged_file:
+                write_to.write(separator + line[:-1])
+                separator = ", "
+        else:
+            shutil.copyfileobj(tagged_file, write_to)
+    os.remove(result.destination)
+    return separator
+
+
+def _map_files(paths, destinations, output, workers, errors, tagged=False):
+    """Run `_process_file` on each file, in a pool of `workers` processes, and
+    yield the results in order.
+    """
+    arguments = (paths, destinations, repeat(output), repeat(errors), repeat(tagged))
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(paths) <= 1:
+        yield from map(_process_file, *arguments)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+        yield from executor.map(_process_file, *arguments)
+
+
+def process_files(
+    paths, output_dir=None, output="jsonl", workers=None, errors="raise", write_to=None
+):
+    """Parse clippings files in a pool of `workers` processes (by default,
+    one per CPU), and yield their `FileResult` in order.
+
+    With an `output_dir`, the clippings of each file are written there in the
+    `output` format (see `output_paths`). Otherwise, they are all written to
+    the `write_to` file object, as JSON Lines or a JSON array, each object
+    starting with the "file" it comes from. The workers write them to
+    temporary files, which are copied to `write_to` in order, so that the
+    clippings are never all in memory. The JSON array is only closed once all
+    the results are consumed.
+
+    A file that fails (e.g. it can't be read, or has an entry that can't be
+    parsed with `errors="raise"`) doesn't stop the others: its result has an
+    `error`.
+    """
+    paths = list(paths)
+    if output_dir is not None:
+        yield from _map_files(
+            paths, output_paths(paths, output_dir, output), output, workers, errors
+        )
+        return
+    if output not in ("json", "jsonl"):
+        raise ValueError(f"{output} output can only be used with an output_dir")
+    if write_to is None:
+        raise ValueError("write_to is required without an output_dir")
+
+    separator = ""
+    if output == "json":
+        write_to.write("[")
+    with tempfile.TemporaryDirectory(prefix="clippings-") as temporary_dir:
+        destinations = [
+            os.path.join(temporary_dir, f"{index}.jsonl") for index in range(len(paths))
+        ]
+        for result in _map_files(paths, destinations, output, workers, errors, tagged=True):
+            if result.error is None:
+                separator = _copy_tagged(result, write_to, output, separator)
+            result.destination = None
+            yield result
+    if output == "json":
+        write_to.write("]")
+
+
+def _report_progress(done, total, clippings, failed, start, end="\r"):
+    print(
+        f"{done:,}/{total:,} files, {clippings:,} clippings"
+        f"{f', {failed:,} failed' if failed else ''} in {perf_counter() - start:.2f} s",
+        file=sys.stderr,
+        end=end,
+        flush=True,
+    )
+
+
+def main(argv=None):
+    """Parse the provided clippings files, and write the result."""
+    parser = argparse.ArgumentParser(
+        prog="clippings batch",
+        description="Parse many Kindle clippings files concurrently",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="clippings files, directories, or glob patterns (e.g. 'a/**/*.txt')",
+    )
+    parser.add_argument(
+        "--pattern",
+        dest="pattern",
+        default=DEFAULT_PATTERN,
+        help=f"pattern of the files searched for in directories (default: {DEFAULT_PATTERN})",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="output",
+        choices=["json", "jsonl", "kindle"],
+        default="jsonl",
+        help="output format. kindle can only be used with --output-dir",
+    )
+    destination = parser.add_mutually_exclusive_group()
+    destination.add_argument(
+        "-w",
+        "--write-to",
+        dest="write_to",
+        default="-",
+        type=argparse.FileType("w"),
+        help="file where all the clippings are written, tagged with their file",
+    )
+    destination.add_argument(
+        "--output-dir",
+        dest="output_dir",
+        help="directory where the clippings of each file are written to their own file",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        help="number of processes used for parsing (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--errors",
+        dest="errors",
+        choices=ERRORS,
+        default="raise",
+        help=(
+            "what to do with entries that can't be parsed: fail the file (default), "
+            "skip them, or skip them and report them to stderr"
+        ),
+    )
+    args = parser.parse_args(argv)
+    if args.output == "kindle" and args.output_dir is None:
+        parser.error("-o kindle can only be used with --output-dir")
+
+    try:
+        paths = find_clippings_files(args.paths, args.pattern)
+    except FileNotFoundError as exception:
+        parser.error(str(exception))
+    if args.output_dir is not None:
+        inputs = {os.path.abspath(path) for path in paths}
+        for path in output_paths(paths, args.output_dir, args.output):
+            if os.path.abspath(path) in inputs:
+                parser.error(f"the output would overwrite the input file {path!r}")
+
+    # Progress is only shown in terminals, where it is updated in place
+    progress = sys.stderr.isatty()
+    clear = "\r\033[K" if progress else ""
+    start = perf_counter()
+    clippings = failed = done = 0
+    for result in process_files(
+        paths, args.output_dir, args.output, args.jobs, args.errors, args.write_to
+    ):
+        done += 1
+        clippings += result.clippings
+        if result.error is not None:
+            failed += 1
+            # On its own line, rather than over the progress
+            print(f"{clear}{result.path}: {result.error}", file=sys.stderr)
+        for failure in result.failures:
+            print(f"{clear}{result.path}: {failure}", file=sys.stderr)
+        if progress:
+            _report_progress(done, len(paths), clippings, failed, start)
+    args.write_to.flush()
+
+    _report_progress(done, len(paths), clippings, failed, start, end="\n")
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,141 @@
+"""Cache of parsed clippings files, on disk.
+
+Parsed clippings are stored (pickled) under a cache directory, keyed by the
+hash of the file content and by the parsers used. When the cache grows over
+its maximum size, the least recently used entries are evicted.
+"""
+
+import hashlib
+import io
+import os
+import pickle
+from typing import Callable
+
+from clippings import __version__
+from clippings import scanner
+from clippings.parser import Document
+from clippings.parser import Metadata
+from clippings.parser import parse_clippings
+from clippings.utils import parser_identity
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024  # Bytes
+READ_SIZE = 1024 * 1024  # Bytes (or characters) read at once when hashing a file
+SUFFIX = ".pickle"
+
+
+class ParseCache:
+    """Cache of parsed clippings files, stored in a directory.
+
+    Parsers are identified by their module and qualified name, so they should
+    be defined at the top level of a module. Cached files are pickles, so the
+    directory shouldn't be writable by untrusted users.
+    """
+
+    def __init__(self, directory, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+
+    def key(self, clippings_file, document_parser, metadata_parser, keep_raw=False):
+        """Return the cache key of a file, read from its current position.
+
+        The file is left at the same position.
+        """
+        hasher = hashlib.sha256()
+        for part in (
+            __version__,
+            parser_identity(document_parser),
+            parser_identity(metadata_parser),
+            "raw" if keep_raw else "",
+        ):
+            hasher.update(part.encode("utf-8") + b"\0")
+
+        start = clippings_file.tell()
+        binary = scanner.is_binary(clippings_file)
+        while True:
+            chunk = clippings_file.read(READ_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk if binary else chunk.encode("utf-8"))
+        clippings_file.seek(start)
+        return hasher.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, key):
+        """Return the clippings stored under a key, or None if there are none."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as cache_file:
+                cached_clippings = pickle.load(cache_file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        os.utime(path)  # Mark as recently used
+        return cached_clippings
+
+    def put(self, key, clippings):
+        """Store clippings under a key, then evict old entries if needed."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as cache_file:
+            pickle.dump(list(clippings), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+        self.evict()
+
+    def evict(self, max_size=None):
+        """Delete the least recently used entries, until the cache fits in
+        `max_size` (by default, its maximum size).
+        """
+        if max_size is None:
+            max_size = self.max_size
+
+        entries = []
+        with os.scandir(self.directory) as directory_entries:
+            for directory_entry in directory_entries:
+                if directory_entry.name.endswith(SUFFIX):
+                    stat = directory_entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, directory_entry.path))
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:  # Evicted by another process
+                pass
+            size -= entry_size
+
+    def clear(self):
+        """Delete all the entries of the cache."""
+        if os.path.isdir(self.directory):
+            self.evict(max_size=-1)
+
+    def parse_clippings(
+        self,
+        clippings_file,
+        document_parser: Callable[[str], Document] = Document.parse,
+        metadata_parser: Callable[[str], Metadata] = Metadata.parse,
+        workers: int = 1,
+        keep_raw: bool = False,
+    ):
+        """Like `clippings.parser.parse_clippings`, but return cached results
+        when the same file was already parsed with the same parsers.
+        """
+        if not clippings_file.seekable():
+            content = clippings_file.read()
+            clippings_file = (
+                io.BytesIO(content) if isinstance(content, bytes) else io.StringIO(content)
+            )
+
+        key = self.key(clippings_file, document_parser, metadata_parser, keep_raw)
+        cached_clippings = self.get(key)
+        if cached_clippings is not None:
+            return cached_clippings
+
+        parsed_clippings = parse_clippings(
+            clippings_file, document_parser, metadata_parser, workers=workers, keep_raw=keep_raw
+        )
+        self.put(key, parsed_clippings)
+        return parsed_clippings
@@ -0,0 +1,88 @@
+"""Checkpoints to resume parsing append-only clippings files.
+
+The Kindle only ever appends to its clippings file. A checkpoint records the
+position right after the last parsed entry, along with a hash of the bytes
+before it. The next parse resumes from there, unless the file was truncated
+or rewritten in the meantime.
+"""
+
+import hashlib
+import json
+
+from clippings import scanner
+from clippings.utils import BasicEqualityMixin
+
+EMPTY_DIGEST = hashlib.sha256().hexdigest()
+READ_SIZE = 1024 * 1024  # Bytes read at once when checking the hash of a file
+
+
+class Checkpoint(BasicEqualityMixin):
+    """Position up to which a clippings file has been parsed.
+
+    - The offset (in bytes) right after the separator of the last parsed entry;
+    - The SHA-256 digest of the bytes before that offset.
+    """
+
+    __slots__ = ("offset", "digest")
+
+    def __init__(self, offset=0, digest=EMPTY_DIGEST):
+        self.offset = offset
+        self.digest = digest
+
+    def __str__(self):
+        return f"{self.offset}:{self.digest}"
+
+    def to_dict(self):
+        return {
+            "offset": self.offset,
+            "digest": self.digest,
+        }
+
+    @classmethod
+    def load(cls, path):
+        """Read a checkpoint from a JSON file, or return a new one if the file doesn't exist."""
+        try:
+            with open(path) as checkpoint_file:
+                return cls(**json.load(checkpoint_file))
+        except FileNotFoundError:
+            return cls()
+
+    def save(self, path):
+        """Write the checkpoint to a JSON file."""
+        with open(path, "w") as checkpoint_file:
+            json.dump(self.to_dict(), checkpoint_file)
+
+    def resume(self, clippings_file):
+        """Position the file where parsing resumes, and return a hash object
+        of the bytes before that position.
+
+        If the file was truncated or rewritten since the checkpoint, parsing
+        resumes from the beginning, and the checkpoint is reset. The file must
+        be opened in binary mode, and be seekable.
+        """
+        if not scanner.is_binary(clippings_file):
+            raise TypeError("Checkpoints require a file opened in binary mode")
+
+        clippings_file.seek(0)
+        hasher = hashlib.sha256()
+        remaining = self.offset
+        while remaining:
+            chunk = clippings_file.read(min(remaining, READ_SIZE))
+            if not chunk:
+                break
+            hasher.update(chunk)
+            remaining -= len(chunk)
+
+        if remaining or hasher.hexdigest() != self.digest:
+            clippings_file.seek(0)
+            hasher = hashlib.sha256()
+            self.offset = 0
+            self.digest = EMPTY_DIGEST
+        return hasher
+
+    def advance(self, hasher, *chunks):
+        """Move the checkpoint past the given bytes, which follow its offset."""
+        for chunk in chunks:
+            hasher.update(chunk)
+            self.offset += len(chunk)
+        self.digest = hasher.hexdigest()
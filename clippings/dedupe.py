@@ -0,0 +1,101 @@
+"""Deduplication of overlapping clippings.
+
+When a highlight is extended, the Kindle adds a new clipping whose location
+overlaps the old one, rather than replacing it. Deduplication drops the
+clippings overlapping a newer (or longer) one.
+"""
+
+import bisect
+
+DEDUPED_CATEGORIES = ("Highlight",)
+
+
+def _newest(clipping):
+    return clipping.metadata.timestamp
+
+
+def _longest(clipping):
+    location = clipping.metadata.location
+    return location.end - location.begin, len(clipping.content)
+
+
+# Which clipping of overlapping ones to keep: the one with the greatest key
+KEEP_POLICIES = {
+    "newest": _newest,
+    "longest": _longest,
+}
+
+
+def _overlaps(location, other):
+    """Return whether two location ranges overlap.
+
+    Consecutive highlights often share their boundary location (e.g. 100-105
+    and 105-110), so sharing a single location only counts as overlapping
+    when one range is within the other.
+    """
+    begin = max(location.begin, other.begin)
+    end = min(location.end, other.end)
+    if begin != end:
+        return begin < end
+    return (other.begin <= location.begin and location.end <= other.end) or (
+        location.begin <= other.begin and other.end <= location.end
+    )
+
+
+def _overlaps_kept(location, kept_locations, kept_ends):
+    """Return whether a location range overlaps one of the kept ranges.
+
+    The kept ranges don't overlap each other, so sorted by beginning, they
+    are also sorted by end, and only those from the first one ending at or
+    after `location.begin` need checking.
+    """
+    position = bisect.bisect_left(kept_ends, location.begin)
+    while position < len(kept_locations) and kept_locations[position].begin <= location.end:
+        if _overlaps(location, kept_locations[position]):
+            return True
+        position += 1
+    return False
+
+
+def dedupe_clippings(clippings, keep="newest", categories=DEDUPED_CATEGORIES):
+    """Return the clippings, without those overlapping another one.
+
+    Clippings overlap if they have the same document and category, and their
+    location ranges intersect (see `_overlaps`). The clippings are kept in
+    the order of the `keep` policy (see `KEEP_POLICIES`): the newest, or the
+    longest, first. On ties, the last clipping comes first. A clipping is
+    dropped when it overlaps one that was already kept, so a clipping is only
+    dropped for one that is actually kept: of 1-5, 3-9 and 8-12 (from the
+    oldest to the newest), 1-5 and 8-12 are kept.
+
+    Only clippings of the given categories are deduplicated (all of them if
+    `categories` is None). The clippings are returned in their original order.
+    """
+    keep_key = KEEP_POLICIES[keep]
+    clippings = list(clippings)
+
+    kept = []
+    groups = {}
+    for index, clipping in enumerate(clippings):
+        category = clipping.metadata.category
+        if categories is None or category in categories:
+            groups.setdefault((clipping.document, category), []).append(index)
+        else:
+            kept.append(index)
+
+    def key(index):
+        return keep_key(clippings[index]), index
+
+    for indices in groups.values():
+        kept_locations = []  # Sorted by beginning, and by end
+        kept_ends = []
+        for index in sorted(indices, key=key, reverse=True):
+            location = clippings[index].metadata.location
+            if not _overlaps_kept(location, kept_locations, kept_ends):
+                position = bisect.bisect_left(kept_ends, location.end)
+                kept_locations.insert(position, location)
+                kept_ends.insert(position, location.end)
+                kept.append(index)
+
+    kept.sort()
+    return [clippings[index] for index in kept]
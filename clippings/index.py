@@ -0,0 +1,93 @@
+"""In-memory index of clippings, for fast lookups."""
+
+import bisect
+import datetime
+from operator import attrgetter
+
+from clippings.parser import Document
+
+_timestamp = attrgetter("metadata.timestamp")
+_location_begin = attrgetter("metadata.location.begin")
+
+
+def _location(clipping):
+    location = clipping.metadata.location
+    return location.begin, location.end
+
+
+class ClippingIndex:
+    """Index of clippings by document, category, timestamp and location.
+
+    The index is built once from an iterable of clippings. Lookups by document
+    or category are hash lookups, and lookups by timestamp or location are
+    binary searches, so their cost depends on the number of clippings found
+    rather than on the size of the index.
+    """
+
+    def __init__(self, clippings=()):
+        self._by_document = {}
+        self._by_category = {}
+        by_timestamp = []
+        for clipping in clippings:
+            self._by_document.setdefault(clipping.document, []).append(clipping)
+            self._by_category.setdefault(clipping.metadata.category, []).append(clipping)
+            by_timestamp.append(clipping)
+
+        by_timestamp.sort(key=_timestamp)
+        self._by_timestamp = by_timestamp
+        self._timestamps = [_timestamp(clipping) for clipping in by_timestamp]
+
+        self._by_location = {
+            document: sorted(document_clippings, key=_location)
+            for document, document_clippings in self._by_document.items()
+        }
+        self._location_begins = {
+            document: [_location_begin(clipping) for clipping in document_clippings]
+            for document, document_clippings in self._by_location.items()
+        }
+
+    def __len__(self):
+        return len(self._by_timestamp)
+
+    @property
+    def documents(self):
+        """Return the indexed documents, in order of first appearance."""
+        return list(self._by_document)
+
+    @property
+    def categories(self):
+        """Return the indexed categories, in order of first appearance."""
+        return list(self._by_category)
+
+    def by_document(self, document: Document):
+        """Return the clippings of a document, in their original order."""
+        return list(self._by_document.get(document, ()))
+
+    def by_category(self, category):
+        """Return the clippings of a category, in their original order."""
+        return list(self._by_category.get(category, ()))
+
+    def between(self, since: datetime.datetime = None, until: datetime.datetime = None):
+        """Return the clippings added in a time range, ordered by timestamp.
+
+        `since` is inclusive, and `until` exclusive. Either can be omitted.
+        """
+        start = 0 if since is None else bisect.bisect_left(self._timestamps, since)
+        stop = (
+            len(self._timestamps) if until is None else bisect.bisect_left(self._timestamps, until)
+        )
+        return self._by_timestamp[start:stop]
+
+    def in_document(self, document: Document, start: int = None, stop: int = None):
+        """Return the clippings of a document, ordered by location.
+
+        If given, only clippings whose location begins in the `start`
+        (inclusive) to `stop` (exclusive) range are returned.
+        """
+        clippings = self._by_location.get(document)
+        if clippings is None:
+            return []
+        begins = self._location_begins[document]
+        first = 0 if start is None else bisect.bisect_left(begins, start)
+        last = len(begins) if stop is None else bisect.bisect_left(begins, stop)
+        return clippings[first:last]
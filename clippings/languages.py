@@ -0,0 +1,190 @@
+"""Parsing of metadata lines written by Kindles in different languages.
+
+Each language has a profile: a single precompiled pattern for its metadata
+lines, the names of its categories, and tables of its month and weekday names.
+Dates are parsed with those tables rather than with `strptime` and
+`setlocale`, which is slow and changes the locale of the whole process.
+
+The language of a metadata line is detected from its first word (e.g. "Your"
+in English, "La" in Spanish), so files mixing several languages can be parsed
+with `parse_metadata`:
+
+    parse_clippings(clippings_file, metadata_parser=parse_metadata)
+"""
+
+import datetime
+import re
+
+from clippings.parser import Location
+from clippings.parser import Metadata
+from clippings.stats import timed
+from clippings.timestamps import parse_timestamp
+
+
+class LanguageProfile:
+    """Format of the metadata lines in one language.
+
+    - `code`: the code of the language (e.g. "en");
+    - `first_words`: the words metadata lines start with, after "- ";
+    - `pattern`: the pattern of the metadata lines, with the named groups
+      "category", "location", "timestamp", and optionally "page";
+    - `categories`: the normalized category ("Highlight", "Note" or
+      "Bookmark") of each category name, in lowercase;
+    - `parse_timestamp`: the parser of the "timestamp" group.
+    """
+
+    def __init__(self, code, first_words, pattern, categories, parse_timestamp):
+        self.code = code
+        self.first_words = tuple(first_words)
+        self.pattern = re.compile(pattern)
+        self.categories = categories
+        self.parse_timestamp = parse_timestamp
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.code}>"
+
+    def parse(self, line):
+        """Parse a metadata line of this language, with its category normalized."""
+        match = self.pattern.match(line)
+        if match is None:
+            raise ValueError(f"Not a metadata line in {self.code!r}: {line!r}")
+        category = match.group("category")
+        page = match.groupdict().get("page")
+        return Metadata(
+            self.categories.get(category.lower(), category),
+            Location.parse(match.group("location")),
+            timed("date", self.parse_timestamp, match.group("timestamp")),
+            None if page is None else int(page),
+        )
+
+
+def timestamp_parser(pattern, months, weekdays):
+    """Return a parser for timestamps matching a pattern.
+
+    The pattern has the named groups "day", "month", "year", "hour", "minute"
+    and "second", and optionally "weekday". Month and weekday names are looked
+    up in lowercase in the `months` (to their number) and `weekdays` tables.
+    """
+    pattern = re.compile(pattern)
+
+    def parse(string):
+        match = pattern.match(string)
+        if match is None:
+            raise ValueError(f"Unknown timestamp format: {string!r}")
+        groups = match.groupdict()
+        month = months.get(groups["month"].lower())
+        if month is None:
+            raise ValueError(f"Unknown month: {groups['month']!r}")
+        # Like for English, the weekday is only checked for validity, not consistency
+        weekday = groups.get("weekday")
+        if weekday is not None and weekday.lower() not in weekdays:
+            raise ValueError(f"Unknown weekday: {weekday!r}")
+        return datetime.datetime(
+            int(groups["year"]),
+            month,
+            int(groups["day"]),
+            int(groups["hour"]),
+            int(groups["minute"]),
+            int(groups["second"]),
+        )
+
+    return parse
+
+
+ENGLISH = LanguageProfile(
+    code="en",
+    first_words=["Your"],
+    pattern=(
+        r"^- Your (?P<category>\w+) (?:on|at) "
+        r"(?:[Pp]age (?P<page>\d+) \| )?"
+        r"[Ll]ocation (?P<location>\d+(?:-\d+)?) \| "
+        r"Added on (?P<timestamp>.+)$"
+    ),
+    categories={
+        "highlight": "Highlight",
+        "note": "Note",
+        "bookmark": "Bookmark",
+    },
+    parse_timestamp=parse_timestamp,
+)
+
+SPANISH = LanguageProfile(
+    code="es",
+    first_words=["La", "El", "Tu"],
+    pattern=(
+        r"^- (?:La|El|Tu) (?P<category>\w+) en (?:la )?"
+        r"(?:página (?P<page>\d+) \| (?:la )?)?"
+        r"posición (?P<location>\d+(?:-\d+)?) \| "
+        r"Añadido (?:el )?(?P<timestamp>.+)$"
+    ),
+    categories={
+        "subrayado": "Highlight",
+        "nota": "Note",
+        "marcador": "Bookmark",
+    },
+    parse_timestamp=timestamp_parser(
+        # miércoles, 6 de julio de 2022 06:54:57
+        r"^(?P<weekday>\w+), (?P<day>\d{1,2}) de (?P<month>\w+) de (?P<year>\d{4}) "
+        r"(?P<hour>\d{1,2}):(?P<minute>\d{2}):(?P<second>\d{2})$",
+        months={
+            name: number
+            for number, names in enumerate(
+                [
+                    ("enero",),
+                    ("febrero",),
+                    ("marzo",),
+                    ("abril",),
+                    ("mayo",),
+                    ("junio",),
+                    ("julio",),
+                    ("agosto",),
+                    ("septiembre", "setiembre"),
+                    ("octubre",),
+                    ("noviembre",),
+                    ("diciembre",),
+                ],
+                start=1,
+            )
+            for name in names
+        },
+        weekdays={"lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"},
+    ),
+)
+
+LANGUAGES = {}
+_LANGUAGES_BY_FIRST_WORD = {}
+
+
+def register_language(profile: LanguageProfile):
+    """Add a language to those detected by `parse_metadata`.
+
+    A language registered later takes precedence for the first words it
+    shares with another one.
+    """
+    LANGUAGES[profile.code] = profile
+    for word in profile.first_words:
+        _LANGUAGES_BY_FIRST_WORD[word] = profile
+
+
+register_language(ENGLISH)
+register_language(SPANISH)
+
+
+def detect_language(line):
+    """Return the profile of the language of a metadata line, or None if it is unknown."""
+    words = line.split(" ", 2)
+    if len(words) < 2:
+        return None
+    return _LANGUAGES_BY_FIRST_WORD.get(words[1])
+
+
+def parse_metadata(line):
+    """Parse a metadata line in any registered language.
+
+    The category is normalized to its English name, so that clippings in
+    different languages can be compared.
+    """
+    profile = detect_language(line)
+    if profile is None:
+        raise ValueError(f"Unknown metadata language: {line!r}")
+    return profile.parse(line)
@@ -0,0 +1,102 @@
+"""Memoization of parsed entries, keyed by their content.
+
+Different copies of a clippings file (e.g. from two devices, or after a few
+entries were deleted) mostly share the same entries. The memo keeps parsed
+clippings keyed by a hash of the raw entry, so that identical entries are
+only parsed once, across files and runs.
+"""
+
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+
+from clippings import __version__
+from clippings.utils import parser_identity
+
+DEFAULT_MAX_ENTRIES = 100000
+KEY_SIZE = 16  # Bytes
+
+
+class EntryMemo:
+    """Bounded memo of parsed clippings, keyed by the hash of their raw entry.
+
+    The least recently used entries are dropped when the memo is full. If a
+    path is given, the memo is loaded from it (starting empty if it can't be
+    read), and `save()` writes it back.
+
+    Clippings returned from the memo are shared: copy them before modifying
+    them. Parsers are identified by their module and qualified name, so they
+    should be defined at the top level of a module.
+    """
+
+    def __init__(self, path=None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._clippings = OrderedDict()
+        if path is not None:
+            try:
+                with open(path, "rb") as memo_file:
+                    self._clippings.update(pickle.load(memo_file))
+            except (OSError, EOFError, pickle.UnpicklingError):
+                self._clippings.clear()
+
+    def __len__(self):
+        return len(self._clippings)
+
+    @property
+    def hit_rate(self):
+        """Fraction of the lookups that were hits (0 if there were none)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @staticmethod
+    def namespace(document_parser, metadata_parser, keep_raw=False):
+        """Return the part of the keys identifying the parsers (and whether
+        the clippings keep their raw lines), for this version of the package.
+        """
+        identities = (
+            f"{__version__}\0{parser_identity(document_parser)}\0"
+            f"{parser_identity(metadata_parser)}\0"
+        )
+        if keep_raw:
+            identities += "raw\0"
+        return identities.encode("utf-8")
+
+    @staticmethod
+    def key(entry, namespace=b""):
+        """Return the key of a raw entry (text or bytes).
+
+        Whitespace around the entry doesn't change its key.
+        """
+        entry = entry.strip()
+        if not isinstance(entry, bytes):
+            entry = entry.encode("utf-8")
+        return hashlib.blake2b(namespace + entry, digest_size=KEY_SIZE).digest()
+
+    def get(self, key):
+        """Return the clipping stored under a key, or None if there is none."""
+        clipping = self._clippings.get(key)
+        if clipping is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._clippings.move_to_end(key)
+        return clipping
+
+    def put(self, key, clipping):
+        """Store a clipping under a key, dropping the least recently used if needed."""
+        self._clippings[key] = clipping
+        self._clippings.move_to_end(key)
+        while len(self._clippings) > self.max_entries:
+            self._clippings.popitem(last=False)
+
+    def save(self, path=None):
+        """Write the memo to a file (by default, the one it was loaded from)."""
+        path = self.path if path is None else path
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as memo_file:
+            pickle.dump(list(self._clippings.items()), memo_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
@@ -0,0 +1,63 @@
+"""Merge of the clippings files of several devices."""
+
+import argparse
+import heapq
+from operator import attrgetter
+from typing import Callable
+
+from clippings.parser import WRITE_FUNCTIONS
+from clippings.parser import Document
+from clippings.parser import Metadata
+from clippings.parser import iter_clippings
+
+_timestamp = attrgetter("metadata.timestamp")
+
+
+def merge_clippings(
+    *clippings_files,
+    document_parser: Callable[[str], Document] = Document.parse,
+    metadata_parser: Callable[[str], Metadata] = Metadata.parse,
+):
+    """Yield the clippings of several files, merged by timestamp.
+
+    The files are streamed, so the clippings of each file are expected to be
+    in chronological order, like the Kindle writes them. Clippings found in
+    several files are only yielded once.
+    """
+    merged_clippings = heapq.merge(
+        *(
+            iter_clippings(clippings_file, document_parser, metadata_parser)
+            for clippings_file in clippings_files
+        ),
+        key=_timestamp,
+    )
+
+    # Duplicates have the same timestamp, so only those of the current
+    # timestamp need to be remembered.
+    seen = set()
+    current_timestamp = None
+    for clipping in merged_clippings:
+        timestamp = _timestamp(clipping)
+        if timestamp != current_timestamp:
+            seen.clear()
+            current_timestamp = timestamp
+        if clipping not in seen:
+            seen.add(clipping)
+            yield clipping
+
+
+def main(argv=None):
+    """Merge the provided clippings files, and print the result."""
+    parser = argparse.ArgumentParser(
+        prog="clippings merge", description="Merge Kindle clippings files by timestamp"
+    )
+    parser.add_argument("files", nargs="+", type=argparse.FileType("rb"))
+    parser.add_argument(
+        "-o", "--output", dest="output", choices=["json", "jsonl", "kindle"], default="kindle"
+    )
+    parser.add_argument(
+        "-w", "--write-to", dest="write_to", default="-", type=argparse.FileType("w")
+    )
+    args = parser.parse_args(argv)
+
+    WRITE_FUNCTIONS[args.output](merge_clippings(*args.files), args.write_to)
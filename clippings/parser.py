@@ -1,38 +1,115 @@
 """Parser for Amazon Kindle clippings file"""
-import argparse
-import json
+# Modules only needed by some functions (e.g. argparse, json, or the process
+# pool) are imported in those functions, to keep the startup of the command
+# line fast.
+import datetime
+import functools
+import importlib
+import io
+import os
 import re
+import sys
+from itertools import islice
+from itertools import repeat
+from time import perf_counter
+from typing import TYPE_CHECKING
 from typing import Callable
 
-import dateutil.parser
-
+from clippings import scanner
+from clippings.stats import ParseStats
+from clippings.stats import timed
+from clippings.timestamps import parse_timestamp
 from clippings.utils import BasicEqualityMixin
-from clippings.utils import DatetimeJSONEncoder
+
+if TYPE_CHECKING:
+    from clippings.checkpoint import Checkpoint
+    from clippings.memo import EntryMemo
 
 DATETIME_FORMAT = "%A, %B %d, %Y %I:%M:%S %p"  # E.g. Friday, May 13, 2016 11:23:26 PM
 CLIPPINGS_SEPARATOR = "=========="
+CLIPPINGS_SEPARATOR_BYTES = CLIPPINGS_SEPARATOR.encode("utf-8")
+CHUNK_SIZE = 64 * 1024  # Characters read at once when streaming a clippings file
+BATCH_SIZE = 1000  # Entries sent at once to a worker process when parsing in parallel
+
+WRITE_BATCH_SIZE = 1000  # Clippings written at once to an output file
+
+# Commands of the command line, and the module implementing them
+SUBCOMMANDS = {
+    "batch": "clippings.batch",
+    "merge": "clippings.merge",
+    "search": "clippings.search",
+    "sqlite": "clippings.sqlite",
+}
+
+# Same output as _json_encoder().encode(clipping.to_dict()), plus a line break
+_JSONL_TEMPLATE = (
+    '{"document": {"title": %s, "authors": %s}, '
+    '"metadata": {"category": %s, "location": {"begin": %d, "end": %d}, '
+    '"timestamp": "%s", "page": %s}, '
+    '"content": %s}\n'
+)
+_UNPARSED = object()  # Placeholder for the attributes of lazy clippings
+
+# What to do with the entries that can't be parsed: raise their exception,
+# skip them, or skip them and collect them (see `EntryFailure`)
+ERRORS = ("raise", "skip", "collect")
+
+
+class RawLineMixin:
+    """Mixin to keep the raw line an object was parsed from.
+
+    As long as the attributes of the object are unchanged, the raw line is
+    returned as its string, rather than formatting it again. Subclasses have
+    a `_raw` slot, and implement `_fingerprint()`, returning the values of the
+    attributes that are formatted in the line.
+    """
+
+    __slots__ = ()
+
+    def keep_raw(self, line):
+        """Keep the raw line, until the attributes of the object are changed."""
+        self._raw = (line, self._fingerprint())
 
+    def _raw_line(self):
+        """Return the raw line, or None if there is none, or it is outdated."""
+        raw = self._raw
+        if raw is not None and raw[1] == self._fingerprint():
+            return raw[0]
+        return None
 
-class Document(BasicEqualityMixin):
+
+class Document(RawLineMixin, BasicEqualityMixin):
     """Document (e.g. book, article) the clipping originates from.
 
     A document has a title, and one or multiple authors (in a string).
     """
 
+    __slots__ = ("title", "authors", "_raw")
+
     PATTERN = re.compile(r"^(?P<title>.+) \((?P<authors>.+?)\)$")
 
     def __init__(self, title, authors=None):
         self.title = title
         self.authors = authors
+        self._raw = None
+
+    def _fingerprint(self):
+        return self.title, self.authors
 
     def __str__(self):
+        raw_line = self._raw_line()
+        if raw_line is not None:
+            return raw_line
         if self.authors:
             return f"{self.title} ({self.authors})"
         else:
             return self.title
 
     def to_dict(self):
-        return self.__dict__
+        return {
+            "title": self.title,
+            "authors": self.authors,
+        }
 
     @classmethod
     def parse(cls, line):
@@ -49,6 +126,8 @@ class Location(BasicEqualityMixin):
     A location consists of a begin-end range.
     """
 
+    __slots__ = ("begin", "end")
+
     def __init__(self, begin, end):
         self.begin = begin
         self.end = end
@@ -60,7 +139,10 @@ class Location(BasicEqualityMixin):
             return f"{self.begin}-{self.end}"
 
     def to_dict(self):
-        return self.__dict__
+        return {
+            "begin": self.begin,
+            "end": self.end,
+        }
 
     @classmethod
     def parse(cls, string):
@@ -73,7 +155,7 @@ class Location(BasicEqualityMixin):
         return cls(int(begin), int(end))
 
 
-class Metadata(BasicEqualityMixin):
+class Metadata(RawLineMixin, BasicEqualityMixin):
     """Metadata about the clipping:
 
     - The category of clipping (Note, Highlight, or Bookmark);
@@ -82,6 +164,8 @@ class Metadata(BasicEqualityMixin):
     - The page within the document (not always present).
     """
 
+    __slots__ = ("category", "location", "timestamp", "page", "_raw")
+
     PATTERN = re.compile(
         r"^- Your (?P<category>\w+) "
         r"(on|at) ([Pp]age (?P<page>\d+) \| )?"
@@ -96,8 +180,17 @@ class Metadata(BasicEqualityMixin):
         self.location = location
         self.timestamp = timestamp
         self.page = page
+        self._raw = None
+
+    def _fingerprint(self):
+        location = self.location
+        return self.category, location.begin, location.end, self.timestamp, self.page
 
     def __str__(self):
+        raw_line = self._raw_line()
+        if raw_line is not None:
+            return raw_line
+
         page_string = "" if self.page is None else f"page {self.page} | "
 
         # Remove leading zero's from the timestamp.
@@ -124,9 +217,11 @@ class Metadata(BasicEqualityMixin):
     @classmethod
     def parse(cls, line):
         match = re.match(cls.PATTERN, line)
+        if match is None:
+            raise ValueError(f"Invalid metadata line: {line!r}")
         category = match.group("category")
         location = Location.parse(match.group("location"))
-        timestamp = dateutil.parser.parse(match.group("timestamp"))
+        timestamp = timed("date", parse_timestamp, match.group("timestamp"))
         try:
             page = int(match.group("page"))
         except TypeError:
@@ -137,10 +232,13 @@ class Metadata(BasicEqualityMixin):
 class Clipping(BasicEqualityMixin):
     """Kindle clipping: content associated with a particular document"""
 
+    __slots__ = ("document", "metadata", "content", "_newline")
+
     def __init__(self, document, metadata, content):
         self.document = document
         self.metadata = metadata
         self.content = content
+        self._newline = "\n"  # Line terminator in the Kindle format
 
     def __str__(self):
         return "\n".join([str(self.document), str(self.metadata), str(self.content)])
@@ -153,31 +251,470 @@ class Clipping(BasicEqualityMixin):
         }
 
 
+class LazyClipping(Clipping):
+    """Clipping parsed from its raw entry on first access.
+
+    The document, metadata and content are each parsed the first time they
+    are accessed, and then cached. Otherwise, lazy clippings behave exactly
+    like regular ones.
+    """
+
+    __slots__ = (
+        "_entry",
+        "_lines",
+        "_document_parser",
+        "_metadata_parser",
+        "_document",
+        "_metadata",
+        "_content",
+    )
+
+    def __init__(
+        self,
+        entry,
+        document_parser: Callable[[str], Document] = Document.parse,
+        metadata_parser: Callable[[str], Metadata] = Metadata.parse,
+    ):
+        self._entry = entry
+        self._lines = None
+        self._document_parser = document_parser
+        self._metadata_parser = metadata_parser
+        self._document = self._metadata = self._content = _UNPARSED
+        self._newline = "\n"
+
+    def _get_lines(self):
+        if self._lines is None:
+            self._lines = scanner.split_entry(self._entry)
+            self._entry = None
+        return self._lines
+
+    @property
+    def document(self):
+        if self._document is _UNPARSED:
+            self._document = self._document_parser(self._get_lines()[0])
+        return self._document
+
+    @document.setter
+    def document(self, document):
+        self._document = document
+
+    @property
+    def metadata(self):
+        if self._metadata is _UNPARSED:
+            self._metadata = self._metadata_parser(self._get_lines()[1])
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, metadata):
+        self._metadata = metadata
+
+    @property
+    def content(self):
+        if self._content is _UNPARSED:
+            self._content = "\n".join(self._get_lines()[3:])
+        return self._content
+
+    @content.setter
+    def content(self, content):
+        self._content = content
+
+
+class EntryFailure(BasicEqualityMixin):
+    """Entry of a clippings file that couldn't be parsed.
+
+    The offset is in bytes for binary files, and in characters for text files.
+    """
+
+    __slots__ = ("offset", "entry", "exception")
+
+    def __init__(self, offset, entry, exception):
+        self.offset = offset
+        self.entry = entry
+        self.exception = exception
+
+    def __str__(self):
+        return f"Entry at offset {self.offset}: {type(self.exception).__name__}: {self.exception}"
+
+    def to_dict(self):
+        entry = self.entry
+        if isinstance(entry, bytes):
+            entry = entry.decode("utf-8", errors="replace")
+        return {
+            "offset": self.offset,
+            "entry": entry,
+            "error": type(self.exception).__name__,
+            "message": str(self.exception),
+        }
+
+
+def _error_handler(errors, failures):
+    """Return the function called with the offset, raw content and exception
+    of each entry that can't be parsed, or None if the exception should be
+    raised instead.
+    """
+    if errors == "raise":
+        return None
+    if errors == "skip":
+        return lambda offset, entry, exception: None
+    if errors == "collect":
+        if failures is None:
+            raise ValueError("A failures list is required to collect errors")
+        return lambda offset, entry, exception: failures.append(
+            EntryFailure(offset, entry, exception)
+        )
+    raise ValueError(f"Unknown errors mode {errors!r}, expected one of {ERRORS}")
+
+
+def _iter_entries(clippings_file, chunk_size=CHUNK_SIZE, checkpoint=None):
+    """Yield the offset and raw content of each entry in the clippings file.
+
+    Binary files are scanned at the byte level, memory-mapping them when
+    possible. Other files are read in chunks of `chunk_size`.
+
+    With a checkpoint, only the entries after it are yielded, and the
+    checkpoint is moved past each entry as it is yielded.
+    """
+    if checkpoint is not None:
+        hasher = checkpoint.resume(clippings_file)
+        for offset, entry in _iter_entries(clippings_file, chunk_size):
+            checkpoint.advance(hasher, entry, CLIPPINGS_SEPARATOR_BYTES)
+            yield offset, entry
+        return
+
+    start = scanner.position(clippings_file)
+    if not scanner.is_binary(clippings_file):
+        yield from scanner.iter_stream_entries(
+            clippings_file, CLIPPINGS_SEPARATOR, chunk_size, start
+        )
+        return
+
+    with scanner.mapped(clippings_file) as buffer:
+        if buffer is None:
+            yield from scanner.iter_stream_entries(
+                clippings_file, CLIPPINGS_SEPARATOR_BYTES, chunk_size, start
+            )
+        else:
+            yield from scanner.iter_buffer_entries(buffer, CLIPPINGS_SEPARATOR_BYTES, start)
+
+
+def _parse_entry_parts(entry, document_parser, metadata_parser, keep_raw=False, stats=None):
+    """Parse the raw content (text or bytes) of a single entry into its
+    document, metadata and content.
+
+    If `keep_raw` is true, the document and metadata keep their raw line,
+    including the BOM before the document. With `stats`, the time spent in
+    each stage is added to them.
+    """
+    if stats is not None:
+        start = perf_counter()
+    lines = scanner.split_entry(entry, keep_bom=keep_raw)
+    if len(lines) < 2:
+        raise ValueError(f"Incomplete entry: {lines!r}")
+
+    raw_document_line = document_line = lines[0]
+    if keep_raw and document_line.startswith(scanner.BOM):
+        document_line = document_line[len(scanner.BOM) :]
+    metadata_line = lines[1]
+    if stats is None:
+        document = document_parser(document_line)
+        metadata = metadata_parser(metadata_line)
+    else:
+        split_end = perf_counter()
+        document = document_parser(document_line)
+        document_end = perf_counter()
+        metadata = stats.time_metadata(metadata_parser, metadata_line)
+        metadata_end = perf_counter()
+
+    if keep_raw:
+        document.keep_raw(raw_document_line)
+        metadata.keep_raw(metadata_line)
+
+    content = "\n".join(lines[3:])
+
+    if stats is not None:
+        stats.stages["split"] += split_end - start + perf_counter() - metadata_end
+        stats.stages["document"] += document_end - split_end
+    return document, metadata, content
+
+
+def _parse_entry(entry, document_parser, metadata_parser, keep_raw=False):
+    """Parse the raw content (text or bytes) of a single entry into a clipping.
+
+    If `keep_raw` is true, the clipping also keeps the line terminator of the
+    entry.
+    """
+    clipping = Clipping(*_parse_entry_parts(entry, document_parser, metadata_parser, keep_raw))
+    if keep_raw:
+        clipping._newline = scanner.line_terminator(entry)
+    return clipping
+
+
+def iter_clippings(
+    clippings_file,
+    document_parser: Callable[[str], Document] = Document.parse,
+    metadata_parser: Callable[[str], Metadata] = Metadata.parse,
+    chunk_size: int = CHUNK_SIZE,
+    lazy: bool = False,
+    checkpoint: "Checkpoint" = None,
+    memo: "EntryMemo" = None,
+    stats: ParseStats = None,
+    errors: str = "raise",
+    failures: list = None,
+    keep_raw: bool = False,
+):
+    """Take a file containing clippings, and yield clipping objects one by one.
+
+    The file can be opened in text or binary mode. Binary files are expected
+    to be UTF-8 encoded, and are memory-mapped when possible. Other files are
+    read in chunks of `chunk_size`, so memory use is bounded by the largest
+    entry rather than by the size of the file.
+
+    If `lazy` is true, `LazyClipping` objects are yielded instead: each entry
+    is only parsed when its attributes are accessed.
+
+    With a checkpoint, only the clippings added to the file since the
+    checkpoint are yielded, and the checkpoint is updated as they are. This
+    requires a seekable file opened in binary mode. If the file was truncated
+    or rewritten since the checkpoint, all the clippings are yielded.
+
+    With a memo, entries that were already parsed (with the same parsers) are
+    taken from it instead, and new ones are added to it.
+
+    With stats, the time spent in each stage of parsing is recorded in them,
+    along with counters of the entries.
+
+    `errors` sets what happens when an entry can't be parsed (see `ERRORS`):
+    by default, its exception is raised. Otherwise, the entry is skipped, and
+    with "collect", an `EntryFailure` is appended to the `failures` list.
+
+    If `keep_raw` is true, the documents and metadata keep the raw line they
+    were parsed from, and return it as their string as long as they aren't
+    modified. The clippings also keep the line terminator of their entry.
+    Writing unmodified clippings back in the Kindle format then gives the
+    original file, byte order marks and CRLF line endings included, and is
+    faster. Binary files keep their line endings, unlike text files opened
+    with universal newlines.
+    """
+    if lazy and memo is not None:
+        raise ValueError("Lazy clippings can't be memoized")
+    if lazy and keep_raw:
+        raise ValueError("Lazy clippings can't keep their raw lines")
+    if stats is not None and (lazy or memo is not None):
+        raise ValueError("Stats can't be collected for lazy or memoized clippings")
+    if lazy and errors != "raise":
+        raise ValueError("Errors of lazy clippings can only be raised")
+    on_error = _error_handler(errors, failures)
+    if memo is not None:
+        namespace = memo.namespace(document_parser, metadata_parser, keep_raw)
+
+    entries = _iter_entries(clippings_file, chunk_size, checkpoint)
+    if stats is not None:
+        yield from _iter_clippings_with_stats(
+            entries, document_parser, metadata_parser, stats, on_error, keep_raw
+        )
+        return
+
+    for offset, entry in entries:
+        if lazy:
+            yield LazyClipping(entry, document_parser, metadata_parser)
+            continue
+
+        try:
+            if memo is None:
+                clipping = _parse_entry(entry, document_parser, metadata_parser, keep_raw)
+            else:
+                key = memo.key(entry, namespace)
+                clipping = memo.get(key)
+                if clipping is None:
+                    clipping = _parse_entry(entry, document_parser, metadata_parser, keep_raw)
+                    memo.put(key, clipping)
+        except Exception as exception:
+            if on_error is None:
+                raise
+            on_error(offset, entry, exception)
+            continue
+        yield clipping
+
+
+def _iter_clippings_with_stats(
+    entries, document_parser, metadata_parser, stats, on_error=None, keep_raw=False
+):
+    """Parse the entries yielded by `_iter_entries`, recording stats as they are."""
+    while True:
+        start = perf_counter()
+        try:
+            offset, entry = next(entries)
+        except StopIteration:
+            return
+        # Reading the entry is part of the split stage
+        stats.stages["split"] += perf_counter() - start
+        try:
+            document, metadata, content = _parse_entry_parts(
+                entry, document_parser, metadata_parser, keep_raw, stats
+            )
+        except Exception as exception:
+            if on_error is None:
+                raise
+            on_error(offset, entry, exception)
+            continue
+
+        seconds = perf_counter() - start
+        stats.add_entry(offset, len(entry), metadata.category, document.title, seconds)
+        clipping = Clipping(document, metadata, content)
+        if keep_raw:
+            clipping._newline = scanner.line_terminator(entry)
+        yield clipping
+
+
+def _parse_entries(entries, document_parser, metadata_parser, keep_raw=False):
+    """Parse a batch of entries. This runs in the worker processes."""
+    return [_parse_entry(entry, document_parser, metadata_parser, keep_raw) for entry in entries]
+
+
+def _try_parse_entries(entries, document_parser, metadata_parser, keep_raw=False):
+    """Parse a batch of (offset, entry) pairs, returning an `EntryFailure`
+    instead of the clipping of each entry that can't be parsed. This runs in
+    the worker processes.
+    """
+    results = []
+    for offset, entry in entries:
+        try:
+            results.append(_parse_entry(entry, document_parser, metadata_parser, keep_raw))
+        except Exception as exception:
+            results.append(EntryFailure(offset, entry, exception))
+    return results
+
+
+def _iter_batches(iterable, size):
+    """Split an iterable into lists of (at most) `size` items."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
 def parse_clippings(
     clippings_file,
     document_parser: Callable[[str], Document] = Document.parse,
     metadata_parser: Callable[[str], Metadata] = Metadata.parse,
+    workers: int = 1,
+    lazy: bool = False,
+    checkpoint: "Checkpoint" = None,
+    memo: "EntryMemo" = None,
+    stats: ParseStats = None,
+    errors: str = "raise",
+    failures: list = None,
+    keep_raw: bool = False,
 ):
-    """Take a file containing clippings, and return a list of objects."""
+    """Take a file containing clippings, and return a list of objects.
 
-    # Last separator not followed by an entry
-    entries = clippings_file.read().split(CLIPPINGS_SEPARATOR)[:-1]
-    clippings = []
+    With more than one worker, entries are parsed in batches by a pool of
+    processes. The parsers must then be picklable, i.e. defined at the top
+    level of a module. The clippings are returned in their original order
+    either way.
 
-    for entry in entries:
-        lines = entry.strip().splitlines()
+    If `lazy` is true, `LazyClipping` objects are returned instead: each entry
+    is only parsed when its attributes are accessed.
 
-        document_line = lines[0]
-        document = document_parser(document_line)
+    With a checkpoint, only the clippings added to the file since the
+    checkpoint are returned, and the checkpoint is updated (see
+    `iter_clippings`).
 
-        metadata_line = lines[1]
-        metadata = metadata_parser(metadata_line)
+    With a memo, entries that were already parsed (with the same parsers) are
+    taken from it instead, and new ones are added to it.
 
-        content = "\n".join(lines[3:])
+    With stats, the time spent in each stage of parsing is recorded in them
+    (see `iter_clippings`).
+
+    `errors` sets what happens when an entry can't be parsed: its exception
+    is raised, or it is skipped, and collected into the `failures` list (see
+    `iter_clippings`).
+
+    If `keep_raw` is true, the clippings keep their raw lines, which are
+    written as-is in the Kindle format while unmodified (see `iter_clippings`).
+    """
+    if lazy and workers > 1:
+        raise ValueError("Lazy clippings can't be parsed by multiple workers")
+    if memo is not None and workers > 1:
+        raise ValueError("Memoized clippings can't be parsed by multiple workers")
+    if stats is not None and workers > 1:
+        raise ValueError("Stats can't be collected by multiple workers")
+
+    if workers <= 1:
+        return list(
+            iter_clippings(
+                clippings_file,
+                document_parser,
+                metadata_parser,
+                lazy=lazy,
+                checkpoint=checkpoint,
+                memo=memo,
+                stats=stats,
+                errors=errors,
+                failures=failures,
+                keep_raw=keep_raw,
+            )
+        )
+
+    on_error = _error_handler(errors, failures)
+    entries = _iter_entries(clippings_file, checkpoint=checkpoint)
+    if on_error is None:
+        entries = (entry for _, entry in entries)
+        batch_parser = _parse_entries
+    else:
+        batch_parser = _try_parse_entries
+    batches = _iter_batches(entries, BATCH_SIZE)
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            batch_parser,
+            batches,
+            repeat(document_parser),
+            repeat(metadata_parser),
+            repeat(keep_raw),
+        )
+        clippings = [clipping for batch in results for clipping in batch]
+
+    if on_error is None:
+        return clippings
+    parsed_clippings = []
+    for clipping in clippings:
+        if isinstance(clipping, EntryFailure):
+            on_error(clipping.offset, clipping.entry, clipping.exception)
+        else:
+            parsed_clippings.append(clipping)
+    return parsed_clippings
 
-        clippings.append(Clipping(document, metadata, content))
 
-    return clippings
+def write_kindle(clippings, fp):
+    """Write the clippings to a file object, in the original Kindle format.
+
+    Clippings parsed with `keep_raw` are written with the line terminator of
+    their entry, so the file object shouldn't translate line endings (e.g.
+    text files opened with `newline=""`).
+
+    The clippings can be any iterable (e.g. a generator). They are written in
+    batches, so the output never has to be in memory all at once.
+    """
+    for batch in _iter_batches(clippings, WRITE_BATCH_SIZE):
+        fp.write(
+            "".join(
+                "\n".join(
+                    [
+                        str(clipping.document),
+                        str(clipping.metadata),
+                        "",
+                        str(clipping.content),
+                        CLIPPINGS_SEPARATOR,
+                        "",
+                    ]
+                ).replace("\n", clipping._newline)
+                for clipping in batch
+            )
+        )
 
 
 def as_kindle(clippings):
@@ -185,19 +722,9 @@ def as_kindle(clippings):
 
     This can useful to programatically create clippings file.
     """
-    string = ""
-    for clipping in clippings:
-        string += "\n".join(
-            [
-                str(clipping.document),
-                str(clipping.metadata),
-                "",
-                str(clipping.content),
-                CLIPPINGS_SEPARATOR,
-                "",
-            ]
-        )
-    return string
+    string_io = io.StringIO()
+    write_kindle(clippings, string_io)
+    return string_io.getvalue()
 
 
 def as_dicts(clippings):
@@ -209,34 +736,278 @@ def as_dicts(clippings):
     return [clipping.to_dict() for clipping in clippings]
 
 
+@functools.lru_cache(maxsize=None)
+def _json_encoder():
+    """Return the encoder of clippings dictionaries to JSON."""
+    from clippings.utils import DatetimeJSONEncoder
+
+    return DatetimeJSONEncoder()
+
+
+def write_json(clippings, fp):
+    """Write the clippings to a file object, as a JSON array.
+
+    The clippings can be any iterable (e.g. a generator). They are written in
+    batches, so the output never has to be in memory all at once.
+    """
+    encode = _json_encoder().encode
+    separator = ""
+    fp.write("[")
+    for batch in _iter_batches(clippings, WRITE_BATCH_SIZE):
+        fp.write(separator + ", ".join(encode(clipping.to_dict()) for clipping in batch))
+        separator = ", "
+    fp.write("]")
+
+
 def as_json(clippings):
     """Return the clippings as a JSON string."""
-    return json.dumps(as_dicts(clippings), cls=DatetimeJSONEncoder)
+    string_io = io.StringIO()
+    write_json(clippings, string_io)
+    return string_io.getvalue()
+
+
+def _encode_jsonl(clipping, encode_string, encoder):
+    """Encode a clipping as a line of JSON.
+
+    Clippings with the standard attribute types are rendered from a template,
+    with `encode_string` encoding strings. Others go through the JSON
+    encoder. Both give the same output.
+    """
+    document = clipping.document
+    metadata = clipping.metadata
+    location = metadata.location
+    page = metadata.page
+    if (
+        type(location.begin) is int
+        and type(location.end) is int
+        and (page is None or type(page) is int)
+        and type(metadata.timestamp) is datetime.datetime
+    ):
+        try:
+            return _JSONL_TEMPLATE % (
+                encode_string(document.title),
+                "null" if document.authors is None else encode_string(document.authors),
+                encode_string(metadata.category),
+                location.begin,
+                location.end,
+                metadata.timestamp.isoformat(),
+                "null" if page is None else page,
+                encode_string(clipping.content),
+            )
+        except TypeError:  # Not strings
+            pass
+    return encoder.encode(clipping.to_dict()) + "\n"
+
+
+def write_jsonl(clippings, fp):
+    """Write the clippings to a file object, as JSON Lines (one object per line).
+
+    The clippings can be any iterable (e.g. a generator). They are written in
+    batches, so the output never has to be in memory all at once.
+    """
+    from json.encoder import encode_basestring_ascii as encode_string
+
+    encoder = _json_encoder()
+    for batch in _iter_batches(clippings, WRITE_BATCH_SIZE):
+        fp.write("".join(_encode_jsonl(clipping, encode_string, encoder) for clipping in batch))
+
+
+def as_jsonl(clippings):
+    """Return the clippings as JSON Lines (one object per line)."""
+    string_io = io.StringIO()
+    write_jsonl(clippings, string_io)
+    return string_io.getvalue()
+
+
+# Which function writes the clippings, depending on the output format
+WRITE_FUNCTIONS = {
+    "kindle": write_kindle,
+    "json": write_json,
+    "jsonl": write_jsonl,
+}
 
 
 def main():
     """Read the provided clippings file, parse it,
     then print it using the provided format.
+
+    If the first argument is one of the `SUBCOMMANDS`, run that command instead.
     """
-    parser = argparse.ArgumentParser(description="Kindle clippings parser")
-    parser.add_argument("file", type=argparse.FileType("r"))
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        subcommand = importlib.import_module(SUBCOMMANDS[sys.argv[1]])
+        subcommand.main(sys.argv[2:])
+        return
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Kindle clippings parser",
+        epilog=f"other commands: {', '.join(SUBCOMMANDS)} (see e.g. clippings sqlite --help)",
+    )
+    parser.add_argument("file", type=argparse.FileType("rb"))
     parser.add_argument(
-        "-o", "--output", dest="output", choices=["json", "dict", "kindle"], default="json"
+        "-o",
+        "--output",
+        dest="output",
+        choices=["json", "jsonl", "dict", "kindle"],
+        default="json",
     )
     parser.add_argument(
         "-w", "--write-to", dest="write_to", default="-", type=argparse.FileType("w")
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        default=1,
+        type=int,
+        help="number of processes used for parsing",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        dest="checkpoint",
+        help="checkpoint file: only output the clippings added since the last run",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        default=os.environ.get("CLIPPINGS_CACHE_DIR"),
+        help=(
+            "directory where parsed files are cached (default: $CLIPPINGS_CACHE_DIR). "
+            "The cache isn't used with --checkpoint."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="cache_dir",
+        action="store_const",
+        const=None,
+        help="don't use the cache",
+    )
+    parser.add_argument(
+        "--dedupe",
+        dest="dedupe",
+        nargs="?",
+        const="newest",
+        choices=["newest", "longest"],
+        help="remove overlapping highlights, keeping the newest (default) or longest",
+    )
+    parser.add_argument(
+        "--stats",
+        dest="stats",
+        action="store_true",
+        help=(
+            "print the time spent in each stage of parsing, and counters, to stderr. "
+            "The cache isn't used with --stats."
+        ),
+    )
+    parser.add_argument(
+        "--errors",
+        dest="errors",
+        choices=ERRORS,
+        default="raise",
+        help=(
+            "what to do with entries that can't be parsed: fail (default), skip them, "
+            "or skip them and report them to stderr. The cache is only used with 'raise'."
+        ),
+    )
+    parser.add_argument(
+        "--quarantine",
+        dest="quarantine",
+        type=argparse.FileType("w"),
+        help=(
+            "write the entries that can't be parsed to this JSONL file "
+            "(implies --errors collect)"
+        ),
+    )
+    parser.add_argument(
+        "--keep-raw",
+        dest="keep_raw",
+        action="store_true",
+        help="write the original lines of the unmodified clippings in the kindle format",
+    )
     args = parser.parse_args()
+    if args.stats and args.jobs > 1:
+        parser.error("--stats can't be used with more than one job")
+    if args.quarantine is not None:
+        args.errors = "collect"
+
+    checkpoint = None
+    if args.checkpoint is not None:
+        from clippings.checkpoint import Checkpoint
+
+        checkpoint = Checkpoint.load(args.checkpoint)
+    stats = ParseStats() if args.stats else None
+    failures = [] if args.errors == "collect" else None
+    if stats is not None:
+        clippings = iter_clippings(
+            args.file,
+            checkpoint=checkpoint,
+            stats=stats,
+            errors=args.errors,
+            failures=failures,
+            keep_raw=args.keep_raw,
+        )
+    elif args.cache_dir is not None and checkpoint is None and args.errors == "raise":
+        from clippings.cache import ParseCache
+
+        clippings = ParseCache(args.cache_dir).parse_clippings(
+            args.file, workers=args.jobs, keep_raw=args.keep_raw
+        )
+    elif args.jobs > 1:
+        clippings = parse_clippings(
+            args.file,
+            workers=args.jobs,
+            checkpoint=checkpoint,
+            errors=args.errors,
+            failures=failures,
+            keep_raw=args.keep_raw,
+        )
+    else:
+        clippings = iter_clippings(
+            args.file,
+            checkpoint=checkpoint,
+            errors=args.errors,
+            failures=failures,
+            keep_raw=args.keep_raw,
+        )
 
-    clippings = parse_clippings(args.file)
+    if args.dedupe is not None:
+        from clippings.dedupe import dedupe_clippings
+
+        clippings = dedupe_clippings(clippings, keep=args.dedupe)
+
+    if stats is not None:
+        write_start = perf_counter()
+        parse_time = stats.parse_time
+
+    if args.output == "dict":
+        print(as_dicts(clippings), file=args.write_to, end="")
+    else:
+        if args.keep_raw and args.output == "kindle":
+            # Write the line terminators of the entries as they are
+            args.write_to.reconfigure(newline="")
+        WRITE_FUNCTIONS[args.output](clippings, args.write_to)
+
+    if stats is not None:
+        # Clippings are parsed as they are written: only count the rest
+        write_time = perf_counter() - write_start
+        stats.stages["serialize"] += write_time - (stats.parse_time - parse_time)
+        stats.report()
+
+    if failures:
+        print(f"Entries that couldn't be parsed: {len(failures)}", file=sys.stderr)
+        if args.quarantine is None:
+            for failure in failures:
+                print(failure, file=sys.stderr)
+        else:
+            for failure in failures:
+                args.quarantine.write(_json_encoder().encode(failure.to_dict()) + "\n")
+    if args.quarantine is not None:
+        args.quarantine.close()
 
-    format_functions = {  # Which function to call, depending on 'output' type
-        "kindle": as_kindle,
-        "dict": as_dicts,
-        "json": as_json,
-    }
-    format_function = format_functions[args.output]
-    print(format_function(clippings), file=args.write_to, end="")
+    if checkpoint is not None:
+        checkpoint.save(args.checkpoint)
 
 
 if __name__ == "__main__":
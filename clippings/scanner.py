@@ -0,0 +1,134 @@
+"""Scanners splitting a clippings file into its raw entries.
+
+Entries are delimited by a separator. The scanners yield each raw entry along
+with its offset in the file: in bytes for binary files, and in characters for
+text files. Binary files are memory-mapped when possible, and their entries
+are only decoded when they are parsed.
+"""
+
+import contextlib
+import io
+import mmap
+
+BOM = "\ufeff"  # Kindle puts a byte order mark before some titles
+
+
+def is_binary(clippings_file):
+    """Whether the file returns bytes rather than text when read."""
+    return isinstance(clippings_file, (io.RawIOBase, io.BufferedIOBase))
+
+
+def position(clippings_file):
+    """Return the current position in the file, or 0 if it isn't seekable."""
+    try:
+        return clippings_file.tell()
+    except (AttributeError, OSError):
+        return 0
+
+
+@contextlib.contextmanager
+def mapped(clippings_file):
+    """Memory-map a binary file for reading.
+
+    Yield None if the file can't be mapped, e.g. for pipes, empty files or
+    in-memory files.
+    """
+    # Other binary files (e.g. gzip files) may have a file descriptor, but
+    # their content isn't the content of that file.
+    if not isinstance(clippings_file, (io.BufferedReader, io.FileIO)):
+        yield None
+        return
+
+    try:
+        buffer = mmap.mmap(clippings_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        yield None
+        return
+
+    with buffer:
+        yield buffer
+
+
+def iter_buffer_entries(buffer, separator, start=0):
+    """Yield the offset and content of each entry in a buffer (e.g. bytes or mmap).
+
+    Entries are copied out of the buffer one at a time. Content following the
+    last separator is not a complete entry, and is ignored.
+    """
+    end = buffer.find(separator, start)
+    while end != -1:
+        yield start, buffer[start:end]
+        start = end + len(separator)
+        end = buffer.find(separator, start)
+
+
+class EntrySplitter:
+    """Incremental splitter of the entries of a stream, fed chunk by chunk.
+
+    `feed(chunk)` returns the offset and content of the entries completed by
+    the chunk. The separator may straddle several chunks. Content following
+    the last separator is not a complete entry, and is never returned.
+    """
+
+    def __init__(self, separator, start=0):
+        self.separator = separator
+        self._pending = separator[:0]
+        self._start = start  # Offset of the pending content
+
+    def feed(self, chunk):
+        """Add a chunk, and return the list of (offset, content) of the
+        entries it completes.
+        """
+        separator = self.separator
+        # The separator may straddle the previous chunk and this one
+        search_from = max(0, len(self._pending) - len(separator) + 1)
+        pending = self._pending + chunk
+        entries = []
+        entry_start = 0
+        end = pending.find(separator, search_from)
+        while end != -1:
+            entries.append((self._start + entry_start, pending[entry_start:end]))
+            entry_start = end + len(separator)
+            end = pending.find(separator, entry_start)
+        self._pending = pending[entry_start:]
+        self._start += entry_start
+        return entries
+
+
+def iter_stream_entries(stream, separator, chunk_size, start=0):
+    """Yield the offset and content of each entry in a stream (text or binary).
+
+    The stream is read in chunks, and the entries of each chunk are yielded
+    as soon as it has been read. Content following the last separator is not
+    a complete entry, and is ignored.
+    """
+    splitter = EntrySplitter(separator, start)
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield from splitter.feed(chunk)
+
+
+def split_entry(entry, keep_bom=False):
+    """Return the lines of a raw entry, without surrounding whitespace or BOM.
+
+    Binary entries are decoded from UTF-8 first, so that text and binary
+    entries are stripped the same way. Both LF and CRLF line endings are
+    supported. With `keep_bom`, the BOM before the first line is kept, so
+    that the line can be written back as it was.
+    """
+    if isinstance(entry, bytes):
+        entry = entry.decode("utf-8")
+    entry = entry.strip()
+    if not keep_bom and entry.startswith(BOM):
+        entry = entry[len(BOM) :]
+    return entry.splitlines()
+
+
+def line_terminator(entry):
+    """Return the line terminator of a raw entry (text or bytes): "\r\n" if
+    it has CRLF line endings, "\n" otherwise.
+    """
+    crlf = b"\r\n" if isinstance(entry, bytes) else "\r\n"
+    return "\r\n" if crlf in entry else "\n"
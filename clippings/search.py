@@ -0,0 +1,186 @@
+"""Full-text search over the content of clippings.
+
+The search index is an inverted index: for each term, the positions where it
+appears in the content of each clipping. Results are ranked with BM25, and
+quoted phrases in queries must appear as-is in the results.
+"""
+
+import argparse
+import hashlib
+import io
+import math
+import os
+import pickle
+import re
+import unicodedata
+
+from clippings.parser import WRITE_FUNCTIONS
+from clippings.parser import iter_clippings
+
+DEFAULT_LIMIT = 10
+FORMAT_VERSION = 1  # Version of the saved indexes
+TOKEN_PATTERN = re.compile(r"\w+")
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text):
+    """Split text into normalized terms: case-folded, and without accents."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(character for character in text if not unicodedata.combining(character))
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+def parse_query(query):
+    """Split a query into its terms, and its (quoted) phrases."""
+    terms = []
+    phrases = []
+    for phrase, words in QUERY_PATTERN.findall(query):
+        if phrase:
+            phrase_terms = tokenize(phrase)
+            terms.extend(phrase_terms)
+            if len(phrase_terms) > 1:
+                phrases.append(phrase_terms)
+        else:
+            terms.extend(tokenize(words))
+    return terms, phrases
+
+
+class SearchIndex:
+    """Inverted index over the content of clippings.
+
+    `postings` maps each term to the positions where it appears, by index of
+    the clipping in `clippings`.
+    """
+
+    def __init__(self, clippings=(), source=None):
+        self.source = source  # Identifies what the index was built from (e.g. a file hash)
+        self.clippings = []
+        self.postings = {}
+        self.lengths = []
+        self.total_length = 0
+        for clipping in clippings:
+            self.add(clipping)
+
+    def __len__(self):
+        return len(self.clippings)
+
+    def add(self, clipping):
+        """Add a clipping to the index."""
+        clipping_id = len(self.clippings)
+        terms = tokenize(clipping.content)
+        for position, term in enumerate(terms):
+            self.postings.setdefault(term, {}).setdefault(clipping_id, []).append(position)
+        self.clippings.append(clipping)
+        self.lengths.append(len(terms))
+        self.total_length += len(terms)
+
+    def _contains_phrase(self, clipping_id, phrase):
+        positions = [set(self.postings[term][clipping_id]) for term in phrase]
+        return any(
+            all(start + offset in positions[offset] for offset in range(1, len(phrase)))
+            for start in positions[0]
+        )
+
+    def _score(self, clipping_id, terms):
+        average_length = self.total_length / len(self.clippings)
+        length_norm = K1 * (1 - B + B * self.lengths[clipping_id] / average_length)
+        score = 0.0
+        for term in terms:
+            term_postings = self.postings.get(term, {})
+            frequency = len(term_postings.get(clipping_id, ()))
+            if frequency:
+                document_frequency = len(term_postings)
+                idf = math.log(
+                    1
+                    + (len(self.clippings) - document_frequency + 0.5) / (document_frequency + 0.5)
+                )
+                score += idf * frequency * (K1 + 1) / (frequency + length_norm)
+        return score
+
+    def search(self, query, limit: int = DEFAULT_LIMIT):
+        """Return the (score, clipping) pairs matching a query, best first.
+
+        Clippings match if they contain any of the terms of the query, and all
+        of its quoted phrases.
+        """
+        terms, phrases = parse_query(query)
+        if phrases:
+            candidates = None
+            for phrase in phrases:
+                if any(term not in self.postings for term in phrase):
+                    return []
+                phrase_candidates = set.intersection(
+                    *(set(self.postings[term]) for term in phrase)
+                )
+                candidates = (
+                    phrase_candidates if candidates is None else candidates & phrase_candidates
+                )
+            candidates = [
+                clipping_id
+                for clipping_id in candidates
+                if all(self._contains_phrase(clipping_id, phrase) for phrase in phrases)
+            ]
+        else:
+            candidates = set()
+            for term in terms:
+                candidates.update(self.postings.get(term, ()))
+
+        scored = [(self._score(clipping_id, terms), clipping_id) for clipping_id in candidates]
+        scored.sort(key=lambda score_and_id: (-score_and_id[0], score_and_id[1]))
+        return [(score, self.clippings[clipping_id]) for score, clipping_id in scored[:limit]]
+
+    def save(self, path):
+        """Write the index to a file."""
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as index_file:
+            pickle.dump((FORMAT_VERSION, self), index_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by `save()`, or return None if it isn't compatible."""
+        with open(path, "rb") as index_file:
+            version, index = pickle.load(index_file)
+        return index if version == FORMAT_VERSION else None
+
+
+def main(argv=None):
+    """Search the provided clippings file, and print the results."""
+    parser = argparse.ArgumentParser(
+        prog="clippings search", description="Search the content of Kindle clippings"
+    )
+    parser.add_argument("query", help='search terms, and "quoted phrases"')
+    parser.add_argument("file", type=argparse.FileType("rb"))
+    parser.add_argument(
+        "-n", "--limit", dest="limit", default=DEFAULT_LIMIT, type=int, help="number of results"
+    )
+    parser.add_argument(
+        "-o", "--output", dest="output", choices=["json", "jsonl", "kindle"], default="kindle"
+    )
+    parser.add_argument(
+        "-w", "--write-to", dest="write_to", default="-", type=argparse.FileType("w")
+    )
+    parser.add_argument(
+        "-i",
+        "--index",
+        dest="index",
+        help="index file, reused if it was built from the same clippings file",
+    )
+    args = parser.parse_args(argv)
+
+    content = args.file.read()
+    source = hashlib.sha256(content).hexdigest()
+    index = None
+    if args.index is not None and os.path.exists(args.index):
+        index = SearchIndex.load(args.index)
+    if index is None or index.source != source:
+        index = SearchIndex(iter_clippings(io.BytesIO(content)), source=source)
+        if args.index is not None:
+            index.save(args.index)
+
+    results = index.search(args.query, args.limit)
+    WRITE_FUNCTIONS[args.output]((clipping for _, clipping in results), args.write_to)
@@ -0,0 +1,131 @@
+"""Export of clippings to a SQLite database.
+
+Clippings are stored in two normalized tables, `documents` and `clippings`,
+indexed for lookups by document, category and timestamp. Each clipping has a
+stable key, so that exporting the same clippings again updates them rather
+than duplicating them.
+"""
+
+import argparse
+import hashlib
+import sqlite3
+
+from clippings.parser import iter_clippings
+
+BATCH_SIZE = 1000  # Clippings inserted at once
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    authors TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS documents_title_authors
+    ON documents (title, IFNULL(authors, ''));
+
+CREATE TABLE IF NOT EXISTS clippings (
+    key TEXT PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents (id),
+    category TEXT NOT NULL,
+    location_begin INTEGER NOT NULL,
+    location_end INTEGER NOT NULL,
+    page INTEGER,
+    timestamp TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS clippings_document_id ON clippings (document_id);
+CREATE INDEX IF NOT EXISTS clippings_category ON clippings (category);
+CREATE INDEX IF NOT EXISTS clippings_timestamp ON clippings (timestamp);
+"""
+
+INSERT_DOCUMENT = "INSERT INTO documents (title, authors) VALUES (?, ?)"
+UPSERT_CLIPPING = "INSERT OR REPLACE INTO clippings VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+
+
+def clipping_key(clipping):
+    """Return a stable key identifying a clipping.
+
+    The key depends on the document, category, location and timestamp, but
+    not on the content, which can be edited (e.g. for notes).
+    """
+    document = clipping.document
+    metadata = clipping.metadata
+    parts = [
+        document.title,
+        document.authors or "",
+        metadata.category,
+        str(metadata.location),
+        metadata.timestamp.isoformat(),
+    ]
+    return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def _document_ids(connection):
+    """Return the ids of the documents already in the database, by (title, authors)."""
+    return {
+        (title, authors): document_id
+        for document_id, title, authors in connection.execute(
+            "SELECT id, title, authors FROM documents"
+        )
+    }
+
+
+def write_sqlite(clippings, database, batch_size: int = BATCH_SIZE):
+    """Insert or update clippings in a SQLite database (a path or a connection).
+
+    The tables are created if needed. The clippings can be any iterable
+    (e.g. a generator), and are inserted in batches. Return the number of
+    clippings written.
+    """
+    connection = (
+        database if isinstance(database, sqlite3.Connection) else sqlite3.connect(database)
+    )
+    try:
+        with connection:
+            connection.executescript(SCHEMA)
+            document_ids = _document_ids(connection)
+            count = 0
+            rows = []
+            for clipping in clippings:
+                document = clipping.document
+                metadata = clipping.metadata
+                document_key = (document.title, document.authors)
+                document_id = document_ids.get(document_key)
+                if document_id is None:
+                    cursor = connection.execute(INSERT_DOCUMENT, document_key)
+                    document_id = document_ids[document_key] = cursor.lastrowid
+
+                rows.append(
+                    (
+                        clipping_key(clipping),
+                        document_id,
+                        metadata.category,
+                        metadata.location.begin,
+                        metadata.location.end,
+                        metadata.page,
+                        metadata.timestamp.isoformat(),
+                        clipping.content,
+                    )
+                )
+                if len(rows) >= batch_size:
+                    connection.executemany(UPSERT_CLIPPING, rows)
+                    count += len(rows)
+                    rows = []
+            connection.executemany(UPSERT_CLIPPING, rows)
+            count += len(rows)
+    finally:
+        if connection is not database:
+            connection.close()
+    return count
+
+
+def main(argv=None):
+    """Parse the provided clippings file, and write it to a SQLite database."""
+    parser = argparse.ArgumentParser(
+        prog="clippings sqlite", description="Export Kindle clippings to a SQLite database"
+    )
+    parser.add_argument("file", type=argparse.FileType("rb"))
+    parser.add_argument("database", help="path of the SQLite database")
+    args = parser.parse_args(argv)
+
+    write_sqlite(iter_clippings(args.file), args.database)
@@ -0,0 +1,113 @@
+"""Instrumentation of parsing: time spent in each stage, and counters.
+
+Stats are only collected when a `ParseStats` object is passed to the parsing
+functions, so parsing without them is as fast as before.
+"""
+
+import contextvars
+import heapq
+import sys
+from collections import Counter
+from time import perf_counter
+
+# Stages of parsing and writing, in order
+STAGES = ("split", "document", "metadata", "date", "serialize")
+DEFAULT_SLOWEST = 5  # Slowest entries kept
+
+# Stats of the entry being parsed, for the stages nested in parsers (e.g. dates)
+_current = contextvars.ContextVar("clippings_stats", default=None)
+
+
+def timed(stage, function, *args):
+    """Call a function, adding its duration to a stage of the stats of the
+    entry being parsed, if any.
+    """
+    stats = _current.get()
+    if stats is None:
+        return function(*args)
+    start = perf_counter()
+    try:
+        return function(*args)
+    finally:
+        stats.stages[stage] += perf_counter() - start
+
+
+class ParseStats:
+    """Stats collected while parsing (and writing) clippings.
+
+    - `stages`: the cumulative time (in seconds) spent in each stage. The time
+      spent parsing dates isn't included in the time of the metadata stage;
+    - `categories`: the number of entries of each category;
+    - `bytes`: the size of the entries (in characters for text files);
+    - `slowest`: the (seconds, offset, title) of the slowest entries to parse,
+      slowest first.
+    """
+
+    def __init__(self, slowest: int = DEFAULT_SLOWEST):
+        self.stages = dict.fromkeys(STAGES, 0.0)
+        self.categories = Counter()
+        self.bytes = 0
+        self.max_slowest = slowest
+        self._slowest = []  # Heap of the slowest entries
+
+    @property
+    def entries(self):
+        """Number of entries parsed."""
+        return sum(self.categories.values())
+
+    @property
+    def slowest(self):
+        return sorted(self._slowest, reverse=True)
+
+    @property
+    def parse_time(self):
+        """Time spent parsing, i.e. in all the stages but serialization."""
+        return sum(seconds for stage, seconds in self.stages.items() if stage != "serialize")
+
+    def time_metadata(self, metadata_parser, line):
+        """Parse a metadata line, timing the dates parsed along the way separately."""
+        date_time = self.stages["date"]
+        token = _current.set(self)
+        start = perf_counter()
+        try:
+            return metadata_parser(line)
+        finally:
+            elapsed = perf_counter() - start
+            _current.reset(token)
+            self.stages["metadata"] += elapsed - (self.stages["date"] - date_time)
+
+    def add_entry(self, offset, size, category, title, seconds):
+        """Count a parsed entry, which took `seconds` to parse."""
+        self.categories[category] += 1
+        self.bytes += size
+        if self.max_slowest > 0:
+            entry = (seconds, offset, title)
+            if len(self._slowest) < self.max_slowest:
+                heapq.heappush(self._slowest, entry)
+            elif entry > self._slowest[0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def summary(self):
+        """Return a human-readable summary of the stats."""
+        total = sum(self.stages.values())
+        lines = [
+            f"Parsed {self.entries:,} entries ({self.bytes / 2**10:,.1f} KiB) "
+            f"in {self.parse_time:.3f} s"
+        ]
+        lines.append("Stages:")
+        for stage, seconds in self.stages.items():
+            share = seconds / total if total else 0.0
+            lines.append(f"  {stage:10} {seconds * 1000:12,.3f} ms {share:7.1%}")
+        categories = ", ".join(
+            f"{category}: {count:,}" for category, count in self.categories.most_common()
+        )
+        lines.append(f"Categories: {categories or '-'}")
+        if self._slowest:
+            lines.append("Slowest entries:")
+            for seconds, offset, title in self.slowest:
+                lines.append(f"  {seconds * 1000:10.3f} ms  at offset {offset}: {title}")
+        return "\n".join(lines)
+
+    def report(self, file=None):
+        """Print the summary (to stderr by default)."""
+        print(self.summary(), file=sys.stderr if file is None else file)
@@ -0,0 +1,215 @@
+"""Columnar storage of clippings, for analytics."""
+
+import calendar
+import datetime
+from array import array
+from typing import Callable
+
+from clippings.parser import CHUNK_SIZE
+from clippings.parser import Clipping
+from clippings.parser import Document
+from clippings.parser import Location
+from clippings.parser import Metadata
+from clippings.parser import _iter_entries
+from clippings.parser import _parse_entry_parts
+
+EPOCH = datetime.datetime(1970, 1, 1)
+NO_PAGE = -1  # Value of the page column for clippings without a page
+
+# Sort keys of ClippingTable.sort(), and the column they sort by
+SORT_COLUMNS = {
+    "document": "document_ids",
+    "category": "category_ids",
+    "location": "location_begins",
+    "page": "pages",
+    "timestamp": "timestamps",
+}
+
+
+class ClippingTable:
+    """Clippings stored column by column.
+
+    Documents and categories are deduplicated: their columns hold indices
+    into the `documents` and `categories` lists. Numeric columns are arrays:
+
+    - `document_ids`, `category_ids`;
+    - `location_begins`, `location_ends`;
+    - `pages`, where clippings without a page have `NO_PAGE`;
+    - `timestamps`, in seconds since the epoch. Naive timestamps are
+      considered to be UTC.
+
+    The `contents` column is a list of strings.
+
+    Filtering, sorting and slicing work on the columns directly, and return
+    new tables. Individual clippings are only created when accessed.
+    """
+
+    def __init__(self):
+        self.documents = []
+        self.categories = []
+        self.document_ids = array("i")
+        self.category_ids = array("i")
+        self.location_begins = array("i")
+        self.location_ends = array("i")
+        self.pages = array("i")
+        self.timestamps = array("q")
+        self.contents = []
+        self._document_ids = {}
+        self._category_ids = {}
+
+    @classmethod
+    def from_clippings(cls, clippings):
+        """Create a table from an iterable of clippings."""
+        table = cls()
+        for clipping in clippings:
+            table.append(clipping)
+        return table
+
+    @classmethod
+    def from_file(
+        cls,
+        clippings_file,
+        document_parser: Callable[[str], Document] = Document.parse,
+        metadata_parser: Callable[[str], Metadata] = Metadata.parse,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        """Parse a file containing clippings straight into a table, without
+        creating clipping objects.
+        """
+        table = cls()
+        for _, entry in _iter_entries(clippings_file, chunk_size):
+            table._append(*_parse_entry_parts(entry, document_parser, metadata_parser))
+        return table
+
+    def append(self, clipping):
+        """Add a clipping at the end of the table."""
+        self._append(clipping.document, clipping.metadata, clipping.content)
+
+    def _append(self, document, metadata, content):
+        self.document_ids.append(self._document_id(document))
+        self.category_ids.append(self._category_id(metadata.category))
+        self.location_begins.append(metadata.location.begin)
+        self.location_ends.append(metadata.location.end)
+        self.pages.append(NO_PAGE if metadata.page is None else metadata.page)
+        self.timestamps.append(calendar.timegm(metadata.timestamp.utctimetuple()))
+        self.contents.append(content)
+
+    def _document_id(self, document):
+        document_id = self._document_ids.get(document)
+        if document_id is None:
+            document_id = self._document_ids[document] = len(self.documents)
+            self.documents.append(document)
+        return document_id
+
+    def _category_id(self, category):
+        category_id = self._category_ids.get(category)
+        if category_id is None:
+            category_id = self._category_ids[category] = len(self.categories)
+            self.categories.append(category)
+        return category_id
+
+    def __len__(self):
+        return len(self.contents)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._clipping(index)
+
+    def __getitem__(self, key):
+        """Return the clipping at an index, or a new table for a slice."""
+        if isinstance(key, slice):
+            return self.take(range(len(self))[key])
+        return self._clipping(range(len(self))[key])
+
+    def _clipping(self, index):
+        page = self.pages[index]
+        metadata = Metadata(
+            self.categories[self.category_ids[index]],
+            Location(self.location_begins[index], self.location_ends[index]),
+            EPOCH + datetime.timedelta(seconds=self.timestamps[index]),
+            None if page == NO_PAGE else page,
+        )
+        return Clipping(self.documents[self.document_ids[index]], metadata, self.contents[index])
+
+    def take(self, indices):
+        """Return a new table with the rows at the given indices, in that order."""
+        table = self.__class__()
+        table.documents = list(self.documents)
+        table.categories = list(self.categories)
+        table._document_ids = dict(self._document_ids)
+        table._category_ids = dict(self._category_ids)
+        for name in (
+            "document_ids",
+            "category_ids",
+            "location_begins",
+            "location_ends",
+            "pages",
+            "timestamps",
+        ):
+            column = getattr(self, name)
+            setattr(table, name, array(column.typecode, [column[index] for index in indices]))
+        table.contents = [self.contents[index] for index in indices]
+        return table
+
+    def filter(
+        self,
+        document: Document = None,
+        category=None,
+        since: datetime.datetime = None,
+        until: datetime.datetime = None,
+    ):
+        """Return a new table with the clippings matching all the given criteria.
+
+        `since` is inclusive, and `until` exclusive.
+        """
+        indices = range(len(self))
+        if document is not None:
+            document_id = self._document_ids.get(document)
+            indices = [index for index in indices if self.document_ids[index] == document_id]
+        if category is not None:
+            category_id = self._category_ids.get(category)
+            indices = [index for index in indices if self.category_ids[index] == category_id]
+        if since is not None:
+            since = calendar.timegm(since.utctimetuple())
+            indices = [index for index in indices if self.timestamps[index] >= since]
+        if until is not None:
+            until = calendar.timegm(until.utctimetuple())
+            indices = [index for index in indices if self.timestamps[index] < until]
+        return self.take(indices)
+
+    def sort(self, by="timestamp", reverse=False):
+        """Return a new table sorted by one of `SORT_COLUMNS` (or a tuple of them).
+
+        The sort is stable, and sorting by location sorts by its beginning.
+        """
+        keys = (by,) if isinstance(by, str) else by
+        columns = [getattr(self, SORT_COLUMNS[key]) for key in keys]
+        if len(columns) == 1:
+            sort_key = columns[0].__getitem__
+        else:
+
+            def sort_key(index):
+                return tuple(column[index] for column in columns)
+
+        return self.take(sorted(range(len(self)), key=sort_key, reverse=reverse))
+
+    def to_numpy(self):
+        """Return the numeric columns as NumPy arrays, in a dictionary.
+
+        The arrays are views on the columns, without copy. The table can't
+        grow while they exist. Timestamps are `datetime64[s]`.
+
+        NumPy must be installed (e.g. `pip install clippings[numpy]`).
+        """
+        import numpy
+
+        return {
+            "document_ids": numpy.frombuffer(self.document_ids, dtype=numpy.intc),
+            "category_ids": numpy.frombuffer(self.category_ids, dtype=numpy.intc),
+            "location_begins": numpy.frombuffer(self.location_begins, dtype=numpy.intc),
+            "location_ends": numpy.frombuffer(self.location_ends, dtype=numpy.intc),
+            "pages": numpy.frombuffer(self.pages, dtype=numpy.intc),
+            "timestamps": numpy.frombuffer(self.timestamps, dtype=numpy.int64).view(
+                "datetime64[s]"
+            ),
+        }
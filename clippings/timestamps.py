@@ -0,0 +1,128 @@
+"""Fast parser for the timestamps found in Kindle clippings metadata.
+
+The Kindle writes timestamps in a handful of known formats, e.g.:
+
+- Friday, May 13, 2016 11:23:26 PM (`DATETIME_FORMAT`, the most common);
+- Friday, May 13, 2016 23:23:26 (24-hour clock);
+- Friday, 13 May 2016 23:23:26 (day first).
+
+Those are parsed with precompiled patterns and lookup tables, which is much
+faster than the general-purpose `dateutil.parser.parse`. Anything else falls
+back to dateutil.
+"""
+
+import datetime
+import functools
+import re
+
+MONTHS = {
+    name.lower(): number
+    for number, names in enumerate(
+        [
+            ("January", "Jan"),
+            ("February", "Feb"),
+            ("March", "Mar"),
+            ("April", "Apr"),
+            ("May",),
+            ("June", "Jun"),
+            ("July", "Jul"),
+            ("August", "Aug"),
+            ("September", "Sep", "Sept"),
+            ("October", "Oct"),
+            ("November", "Nov"),
+            ("December", "Dec"),
+        ],
+        start=1,
+    )
+    for name in names
+}
+
+WEEKDAYS = {
+    name.lower()
+    for names in [
+        ("Monday", "Mon"),
+        ("Tuesday", "Tue"),
+        ("Wednesday", "Wed"),
+        ("Thursday", "Thu"),
+        ("Friday", "Fri"),
+        ("Saturday", "Sat"),
+        ("Sunday", "Sun"),
+    ]
+    for name in names
+}
+
+TIME_PATTERN = re.compile(
+    r"^(?P<date>.+) "
+    r"(?P<hour>\d{1,2}):(?P<minute>\d{2}):(?P<second>\d{2})"
+    r"(?: (?P<meridiem>[AaPp][Mm]))?$"
+)
+
+DATE_PATTERNS = [
+    # Friday, May 13, 2016
+    re.compile(r"^(?P<weekday>\w+), (?P<month>\w+) (?P<day>\d{1,2}), (?P<year>\d{4})$"),
+    # Friday, 13 May 2016
+    re.compile(r"^(?P<weekday>\w+), (?P<day>\d{1,2}) (?P<month>\w+) (?P<year>\d{4})$"),
+]
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date(string):
+    """Return the (year, month, day) of a date string, or None if the format
+    isn't recognized.
+
+    Many clippings share the same day, so results are memoized.
+    """
+    for pattern in DATE_PATTERNS:
+        match = pattern.match(string)
+        if match is None:
+            continue
+        # Like dateutil, the weekday is only checked for validity, not consistency
+        if match.group("weekday").lower() not in WEEKDAYS:
+            return None
+        month = MONTHS.get(match.group("month").lower())
+        if month is None:
+            return None
+        return int(match.group("year")), month, int(match.group("day"))
+    return None
+
+
+def _parse_known_format(string):
+    """Parse a timestamp in one of the known Kindle formats, or return None."""
+    match = TIME_PATTERN.match(string)
+    if match is None:
+        return None
+
+    date = _parse_date(match.group("date"))
+    if date is None:
+        return None
+
+    hour = int(match.group("hour"))
+    meridiem = match.group("meridiem")
+    if meridiem is not None:
+        if not 1 <= hour <= 12:
+            return None
+        hour %= 12
+        if meridiem.upper() == "PM":
+            hour += 12
+
+    try:
+        return datetime.datetime(
+            date[0], date[1], date[2], hour, int(match.group("minute")), int(match.group("second"))
+        )
+    except ValueError:
+        return None
+
+
+def parse_timestamp(string):
+    """Parse the timestamp of a metadata line into a datetime.
+
+    Known Kindle formats are handled directly, anything else is delegated to
+    `dateutil.parser.parse`.
+    """
+    timestamp = _parse_known_format(string)
+    if timestamp is None:
+        # Only imported when needed, as it is slow to import
+        import dateutil.parser
+
+        timestamp = dateutil.parser.parse(string)
+    return timestamp
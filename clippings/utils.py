@@ -1,28 +1,83 @@
 """Various utilies not related to parsing per se."""
 
 import datetime
-import json
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def _public_slots(cls):
+    """Return the names of the public slots of a class, including inherited ones."""
+    names = {}  # Ordered set
+    for base in reversed(cls.__mro__):
+        slots = base.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name[0] != "_":
+                names[name] = None
+    return tuple(names)
 
 
 class BasicEqualityMixin:
-    """Mixin to facilitate implementing the equality operator
+    """Mixin to facilitate implementing the equality operator, and hashing
 
     Subclasses of this will test for equality by checking the type, then
-    comparing the attributes dictionary.
+    comparing the attributes (from the `__slots__` of the class and its bases,
+    except private ones starting with an underscore, and the attributes
+    dictionary if any). Instances of a
+    class and of its subclasses can be equal, as long as their attributes are.
+
+    Equal objects have the same hash, so they can be used in sets or as
+    dictionary keys. Like for any mutable object, they shouldn't be modified
+    while they are.
     """
 
+    __slots__ = ()
+
     def __eq__(self, other):
-        return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+        return (
+            isinstance(other, BasicEqualityMixin)
+            and (isinstance(other, self.__class__) or isinstance(self, other.__class__))
+            and self._attributes() == other._attributes()
+        )
 
+    def __hash__(self):
+        return hash(tuple(self._attributes().values()))
 
-class DatetimeJSONEncoder(json.JSONEncoder):
-    """JSON ecoder that can handle datetime objects.
+    def _attributes(self):
+        """Return the attributes compared for equality."""
+        attributes = {name: getattr(self, name) for name in _public_slots(type(self))}
+        attributes.update(getattr(self, "__dict__", ()))
+        return attributes
+
+
+def parser_identity(parser):
+    """Return a string identifying a parser function, across processes."""
+    return f"{parser.__module__}.{parser.__qualname__}"
+
+
+def _datetime_json_encoder():
+    import json
+
+    class DatetimeJSONEncoder(json.JSONEncoder):
+        """JSON ecoder that can handle datetime objects.
+
+        The datatime will be encoded as a string, in ISO format.
+        """
+
+        def default(self, obj):
+            if isinstance(obj, datetime.datetime):
+                return obj.isoformat()
+            else:
+                return json.JSONEncoder.default(self, obj)
+
+    DatetimeJSONEncoder.__module__ = __name__
+    DatetimeJSONEncoder.__qualname__ = "DatetimeJSONEncoder"
+    return DatetimeJSONEncoder
 
-    The datatime will be encoded as a string, in ISO format.
-    """
 
-    def default(self, obj):
-        if isinstance(obj, datetime.datetime):
-            return obj.isoformat()
-        else:
-            return json.JSONEncoder.default(self, obj)
+def __getattr__(name):
+    # `DatetimeJSONEncoder` is only defined on first use, so that importing
+    # this module (and the parser) doesn't import json.
+    if name == "DatetimeJSONEncoder":
+        globals()[name] = _datetime_json_encoder()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
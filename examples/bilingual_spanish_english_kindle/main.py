@@ -1,17 +1,16 @@
 from pprint import pprint
 from sys import argv
 
+from clippings.languages import parse_metadata
 from clippings.parser import parse_clippings
 
-from .en_or_es_metadata_parser import en_or_es_metadata_parser
-
 
 def print_spanish_english_parsed_clippings(clippings_fl_path: str, out_fl_path: str):
     """Parse @clippings_fl_path then print the result to @out_fl_path."""
 
     with open(clippings_fl_path, encoding="utf-8") as f:
-        # Parse clippings using @en_or_es_metadata_parser
-        clippings = parse_clippings(f, metadata_parser=en_or_es_metadata_parser)
+        # Parse clippings using the built-in English and Spanish metadata parsers
+        clippings = parse_clippings(f, metadata_parser=parse_metadata)
 
         # Write parsed result to @out_fl_path
         with open(out_fl_path, "w", encoding="utf-8") as o:
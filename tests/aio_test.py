@@ -0,0 +1,87 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from clippings.aio import aparse_clippings
+
+
+async def achunks(data, size):
+    for start in range(0, len(data), size):
+        await asyncio.sleep(0)
+        yield data[start : start + size]
+
+
+async def alist(async_iterable):
+    return [item async for item in async_iterable]
+
+
+def stream_reader(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+def test_aparse_clippings_stream_reader(clippings_bytes, parsed_clippings):
+    async def parse():
+        return await alist(aparse_clippings(stream_reader(clippings_bytes)))
+
+    assert asyncio.run(parse()) == parsed_clippings
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 12, 1000, 100000])
+def test_aparse_clippings_chunks(clippings_bytes, parsed_clippings, chunk_size):
+    clippings = asyncio.run(alist(aparse_clippings(achunks(clippings_bytes, chunk_size))))
+    assert clippings == parsed_clippings
+
+
+def test_aparse_clippings_text_chunks(clippings_bytes, parsed_clippings):
+    text = clippings_bytes.decode("utf-8")
+    assert asyncio.run(alist(aparse_clippings(achunks(text, 100)))) == parsed_clippings
+
+
+@pytest.mark.parametrize("executor_class", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_aparse_clippings_executor(clippings_bytes, parsed_clippings, executor_class):
+    async def parse(executor):
+        clippings = aparse_clippings(stream_reader(clippings_bytes), executor=executor)
+        return await alist(clippings)
+
+    with executor_class(max_workers=2) as executor:
+        assert asyncio.run(parse(executor)) == parsed_clippings
+
+
+def test_aparse_clippings_yields_complete_entries(clippings_bytes, parsed_clippings):
+    """Clippings are yielded before the end of the stream."""
+
+    async def parse():
+        reader = asyncio.StreamReader()
+        reader.feed_data(clippings_bytes)
+        clippings = aparse_clippings(reader)
+        first = await clippings.__anext__()
+        await clippings.aclose()
+        return first
+
+    assert asyncio.run(parse()) == parsed_clippings[0]
+
+
+def test_aparse_clippings_concurrent_streams(clippings_bytes, parsed_clippings):
+    async def parse_all():
+        return await asyncio.gather(
+            *(alist(aparse_clippings(achunks(clippings_bytes, 50))) for _ in range(5))
+        )
+
+    assert asyncio.run(parse_all()) == [parsed_clippings] * 5
+
+
+def test_aparse_clippings_incomplete_entry(clippings_bytes, parsed_clippings):
+    data = clippings_bytes + b"Title (Author)\r\n- Your Note"
+    assert asyncio.run(alist(aparse_clippings(achunks(data, 64)))) == parsed_clippings
+
+
+def test_aparse_clippings_empty():
+    async def parse():
+        return await alist(aparse_clippings(stream_reader(b"")))
+
+    assert asyncio.run(parse()) == []
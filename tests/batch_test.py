@@ -0,0 +1,241 @@
+import io
+import json
+import os.path
+import shutil
+from unittest import mock
+
+import pytest
+
+from clippings.batch import FileResult
+from clippings.batch import find_clippings_files
+from clippings.batch import main as batch_main
+from clippings.batch import output_paths
+from clippings.batch import process_files
+from clippings.parser import as_json
+from clippings.parser import as_jsonl
+from clippings.parser import as_kindle
+from clippings.parser import parse_clippings
+
+TEST_RESOURCES_DIR = os.path.join("tests", "resources")
+
+
+@pytest.fixture(name="uploads")
+def fixture_uploads(tmp_path):
+    """Tree of clippings files uploaded by several users."""
+    for user, resource in [("alice", "clippings.txt"), ("bob", "clippings-new-format.txt")]:
+        (tmp_path / user).mkdir()
+        shutil.copy(
+            os.path.join(TEST_RESOURCES_DIR, resource), tmp_path / user / "My Clippings.txt"
+        )
+    (tmp_path / "bob" / "notes.md").write_text("Not a clippings file")
+    return tmp_path
+
+
+def parse_file(path):
+    with open(path, "rb") as clippings_file:
+        return parse_clippings(clippings_file)
+
+
+def user_file(uploads, user):
+    return str(uploads / user / "My Clippings.txt")
+
+
+def test_find_clippings_files_in_directory(uploads):
+    assert find_clippings_files([str(uploads)]) == [
+        user_file(uploads, "alice"),
+        user_file(uploads, "bob"),
+    ]
+
+
+def test_find_clippings_files_pattern(uploads):
+    assert find_clippings_files([str(uploads)], pattern="*.md") == [
+        str(uploads / "bob" / "notes.md")
+    ]
+
+
+def test_find_clippings_files_glob(uploads):
+    assert find_clippings_files([str(uploads / "**" / "*.txt")]) == [
+        user_file(uploads, "alice"),
+        user_file(uploads, "bob"),
+    ]
+
+
+def test_find_clippings_files_keeps_order_without_duplicates(uploads):
+    paths = [user_file(uploads, "bob"), str(uploads), str(uploads / "alice" / ".." / "bob")]
+    assert find_clippings_files(paths) == [user_file(uploads, "bob"), user_file(uploads, "alice")]
+
+
+def test_find_clippings_files_name_like_glob(uploads):
+    path = uploads / "My Clippings [old].txt"
+    path.write_text("")
+    assert find_clippings_files([str(path)]) == [str(path)]
+
+
+@pytest.mark.parametrize("name", ["missing.txt", "*.missing"])
+def test_find_clippings_files_missing(uploads, name):
+    with pytest.raises(FileNotFoundError):
+        find_clippings_files([str(uploads / name)])
+
+
+def test_output_paths_keep_tree(uploads):
+    paths = [user_file(uploads, "alice"), user_file(uploads, "bob")]
+    assert output_paths(paths, "out", "json") == [
+        os.path.join("out", "alice", "My Clippings.json"),
+        os.path.join("out", "bob", "My Clippings.json"),
+    ]
+
+
+def test_output_paths_single_file(uploads):
+    assert output_paths([user_file(uploads, "alice")], "out", "kindle") == [
+        os.path.join("out", "My Clippings.txt")
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_process_files_tagged(uploads, workers):
+    paths = [user_file(uploads, "alice"), user_file(uploads, "bob")]
+    output = io.StringIO()
+    results = list(process_files(paths, workers=workers, write_to=output))
+    assert [result.path for result in results] == paths
+    expected_dicts = []
+    for path, result in zip(paths, results):
+        clipping_dicts = json.loads(as_json(parse_file(path)))
+        assert result.clippings == len(clipping_dicts)
+        assert result.destination is None
+        assert result.error is None
+        expected_dicts += [{"file": path, **clipping_dict} for clipping_dict in clipping_dicts]
+    lines = output.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == expected_dicts
+    # The file comes first
+    assert lines[0].startswith(f'{{"file": {json.dumps(paths[0])}, "document": ')
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_process_files_json_array(uploads, workers):
+    paths = [user_file(uploads, "alice"), user_file(uploads, "bob")]
+    output = io.StringIO()
+    results = process_files(paths, output="json", workers=workers, write_to=output)
+    assert sum(result.clippings for result in results) == 7
+    assert len(json.loads(output.getvalue())) == 7
+
+
+def test_process_files_removes_temporary_files(uploads, tmp_path):
+    paths = [user_file(uploads, "alice"), user_file(uploads, "bob")]
+    with mock.patch("tempfile.tempdir", str(tmp_path)):
+        for _ in process_files(paths, workers=1, write_to=io.StringIO()):
+            (temporary_dir,) = tmp_path.glob("clippings-*")
+            # Each file is removed once copied
+            assert list(temporary_dir.iterdir()) == []
+    assert list(tmp_path.glob("clippings-*")) == []
+
+
+@pytest.mark.parametrize("output, write_to", [("kindle", io.StringIO()), ("jsonl", None)])
+def test_process_files_combined_arguments(uploads, output, write_to):
+    with pytest.raises(ValueError):
+        next(process_files([user_file(uploads, "alice")], output=output, write_to=write_to))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_process_files_output_dir(uploads, tmp_path, workers):
+    paths = [user_file(uploads, "alice"), user_file(uploads, "bob")]
+    output_dir = tmp_path / "out"
+    results = list(process_files(paths, str(output_dir), "kindle", workers=workers))
+    for path, result in zip(paths, results):
+        with open(result.destination, encoding="utf-8") as output_file:
+            assert output_file.read() == as_kindle(parse_file(path))
+
+
+def test_process_files_error_doesnt_stop_others(uploads, tmp_path):
+    bad_path = uploads / "bad.txt"
+    bad_path.write_text("Not a clippings file\n==========\n")
+    paths = [str(bad_path), user_file(uploads, "alice")]
+    output_dir = tmp_path / "out"
+    bad_result, result = process_files(paths, str(output_dir), "json", workers=1)
+    assert bad_result.clippings == 0
+    assert bad_result.error.startswith("ValueError: ")
+    assert not os.path.exists(bad_result.destination)  # No partial output
+    assert result.error is None
+    assert result.clippings == 5
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_process_files_any_error_doesnt_stop_others(uploads, tmp_path, workers):
+    # The fallback timestamp parser raises OverflowError, not a ValueError
+    bad_path = uploads / "bad.txt"
+    bad_path.write_text(
+        "1984 (George Orwell)\n"
+        "- Your Highlight on Location 1-2 | Added on 99999999999999999999999\n"
+        "\n"
+        "It was a bright cold day in April\n"
+        "==========\n"
+    )
+    paths = [str(bad_path), user_file(uploads, "alice")]
+    bad_result, result = process_files(paths, str(tmp_path / "out"), workers=workers)
+    assert bad_result.error.startswith("OverflowError: ")
+    assert not os.path.exists(bad_result.destination)
+    assert result.error is None
+    assert result.clippings == 5
+
+
+def test_process_files_collect(uploads):
+    bad_path = uploads / "bad.txt"
+    bad_path.write_text("Not a clippings file\n==========\n")
+    output = io.StringIO()
+    (result,) = process_files([str(bad_path)], workers=1, errors="collect", write_to=output)
+    assert result.error is None
+    assert len(result.failures) == 1
+    assert output.getvalue() == ""
+
+
+def test_file_result_repr():
+    assert repr(FileResult("a.txt", 3)) == "<FileResult a.txt: 3 clippings>"
+
+
+def test_main_combined_json(capsys, uploads):
+    batch_main([str(uploads), "-o", "json", "-j", "2"])
+    out, err = capsys.readouterr()
+    expected = [
+        {"file": user_file(uploads, user), **clipping_dict}
+        for user in ("alice", "bob")
+        for clipping_dict in json.loads(as_json(parse_file(user_file(uploads, user))))
+    ]
+    assert json.loads(out) == expected
+    assert err.startswith("2/2 files, 7 clippings in ")
+
+
+def test_main_output_dir(capsys, uploads, tmp_path):
+    output_dir = tmp_path / "out"
+    batch_main([str(uploads / "*" / "*.txt"), "--output-dir", str(output_dir)])
+    assert capsys.readouterr().out == ""
+    for user in ("alice", "bob"):
+        with open(output_dir / user / "My Clippings.jsonl", encoding="utf-8") as output_file:
+            assert output_file.read() == as_jsonl(parse_file(user_file(uploads, user)))
+
+
+def test_main_failed_file(capsys, uploads):
+    (uploads / "bad.txt").write_text("Not a clippings file\n==========\n")
+    with pytest.raises(SystemExit) as exc_info:
+        batch_main([str(uploads)])
+    assert exc_info.value.code == 1
+    out, err = capsys.readouterr()
+    assert len(out.splitlines()) == 7
+    assert f"{uploads / 'bad.txt'}: ValueError: Incomplete entry" in err
+    assert "3/3 files, 7 clippings, 1 failed in " in err
+
+
+def test_main_kindle_requires_output_dir(capsys, uploads):
+    with pytest.raises(SystemExit):
+        batch_main([str(uploads), "-o", "kindle"])
+    assert "--output-dir" in capsys.readouterr().err
+
+
+def test_main_doesnt_overwrite_inputs(capsys, uploads):
+    with pytest.raises(SystemExit):
+        batch_main([str(uploads), "-o", "kindle", "--output-dir", str(uploads)])
+    assert "would overwrite" in capsys.readouterr().err
+
+
+def test_main_missing_file(capsys, uploads):
+    with pytest.raises(SystemExit):
+        batch_main([str(uploads / "missing.txt")])
+    assert "missing.txt" in capsys.readouterr().err
@@ -0,0 +1,91 @@
+import io
+import os
+import os.path
+from unittest import mock
+
+import pytest
+
+from clippings.cache import ParseCache
+from clippings.parser import Document
+from clippings.parser import Metadata
+from tests.helpers import parse_document_upper
+
+
+@pytest.fixture(name="cache")
+def fixture_cache(tmp_path):
+    return ParseCache(tmp_path / "cache")
+
+
+def cached_parse(cache, path, mode="rb", **kwargs):
+    with open(path, mode) as clippings_file:
+        return cache.parse_clippings(clippings_file, **kwargs)
+
+
+def test_cache_miss_then_hit(cache, clippings_file_path, parsed_clippings):
+    assert cached_parse(cache, clippings_file_path) == parsed_clippings
+    assert len(os.listdir(cache.directory)) == 1
+
+    with mock.patch("clippings.parser._parse_entry") as parse_entry_mock:
+        assert cached_parse(cache, clippings_file_path) == parsed_clippings
+
+    parse_entry_mock.assert_not_called()
+
+
+def test_cache_text_and_pipe(cache, clippings_file_path, parsed_clippings):
+    assert cached_parse(cache, clippings_file_path, mode="r") == parsed_clippings
+
+    with open(clippings_file_path, "rb") as clippings_file:
+        pipe = io.BufferedReader(io.BytesIO(clippings_file.read()))
+    with mock.patch.object(pipe, "seekable", return_value=False):
+        assert cache.parse_clippings(pipe) == parsed_clippings
+
+
+def test_cache_key(cache, clippings_file_path, tmp_path):
+    with open(clippings_file_path, "rb") as clippings_file:
+        content = clippings_file.read()
+    key = cache.key(io.BytesIO(content), Document.parse, Metadata.parse)
+
+    assert cache.key(io.BytesIO(content), Document.parse, Metadata.parse) == key
+    assert cache.key(io.BytesIO(content + b"\n"), Document.parse, Metadata.parse) != key
+    assert cache.key(io.BytesIO(content), parse_document_upper, Metadata.parse) != key
+    assert cache.key(io.BytesIO(content), Document.parse, Metadata.parse, keep_raw=True) != key
+
+    clippings_file = io.BytesIO(content)
+    cache.key(clippings_file, Document.parse, Metadata.parse)
+    assert clippings_file.tell() == 0
+
+
+def test_cache_different_parsers(cache, clippings_file_path):
+    cached_parse(cache, clippings_file_path)
+    clippings = cached_parse(cache, clippings_file_path, document_parser=parse_document_upper)
+    assert clippings[0].document.title == "JAVA CONCURRENCY IN PRACTICE"
+
+
+def test_cache_corrupt_entry(cache, clippings_file_path, parsed_clippings):
+    cached_parse(cache, clippings_file_path)
+    (cache_file_name,) = os.listdir(cache.directory)
+    with open(os.path.join(cache.directory, cache_file_name), "wb") as cache_file:
+        cache_file.write(b"garbage")
+
+    assert cached_parse(cache, clippings_file_path) == parsed_clippings
+
+
+def test_cache_eviction(cache, parsed_clippings):
+    for clipping in parsed_clippings[:3]:
+        cache.put(str(clipping.metadata.location), [clipping])
+    entry_size = os.path.getsize(os.path.join(cache.directory, "4769-4770.pickle"))
+
+    # Make the first entry the most recently used
+    cache.get("4769-4770")
+    os.utime(os.path.join(cache.directory, "1261-1265.pickle"), (0, 0))
+    cache.max_size = entry_size * 2
+    cache.put(str(parsed_clippings[3].metadata.location), parsed_clippings[3:4])
+
+    assert sorted(os.listdir(cache.directory)) == ["20.pickle", "4769-4770.pickle"]
+
+
+def test_cache_clear(cache, parsed_clippings):
+    cache.clear()
+    cache.put("key", parsed_clippings)
+    cache.clear()
+    assert os.listdir(cache.directory) == []
@@ -0,0 +1,106 @@
+import io
+
+import pytest
+
+from clippings.checkpoint import EMPTY_DIGEST
+from clippings.checkpoint import Checkpoint
+from clippings.parser import as_kindle
+from clippings.parser import iter_clippings
+from clippings.parser import parse_clippings
+
+
+@pytest.fixture(name="clippings_path")
+def fixture_clippings_path(tmp_path, parsed_clippings):
+    path = tmp_path / "clippings.txt"
+    path.write_text(as_kindle(parsed_clippings[:3]))
+    return path
+
+
+def parse(path, checkpoint, **kwargs):
+    with open(path, "rb") as clippings_file:
+        return parse_clippings(clippings_file, checkpoint=checkpoint, **kwargs)
+
+
+def end_offset(path):
+    """Offset right after the last separator, which is followed by a line break."""
+    return path.stat().st_size - len("\n")
+
+
+def append(path, text):
+    with open(path, "a") as clippings_file:
+        clippings_file.write(text)
+
+
+def test_checkpoint_full_parse(clippings_path, parsed_clippings):
+    checkpoint = Checkpoint()
+    assert parse(clippings_path, checkpoint) == parsed_clippings[:3]
+    assert checkpoint.offset == end_offset(clippings_path)
+    assert checkpoint.digest != EMPTY_DIGEST
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_checkpoint_resume(clippings_path, parsed_clippings, workers):
+    checkpoint = Checkpoint()
+    parse(clippings_path, checkpoint)
+
+    append(clippings_path, as_kindle(parsed_clippings[3:]))
+    assert parse(clippings_path, checkpoint, workers=workers) == parsed_clippings[3:]
+    assert checkpoint.offset == end_offset(clippings_path)
+
+    assert parse(clippings_path, checkpoint, workers=workers) == []
+
+
+def test_checkpoint_incomplete_entry(clippings_path, parsed_clippings):
+    checkpoint = Checkpoint()
+    parse(clippings_path, checkpoint)
+    offset = checkpoint.offset
+
+    last_entry = as_kindle(parsed_clippings[3:4])
+    append(clippings_path, last_entry[:20])
+    assert parse(clippings_path, checkpoint) == []
+    assert checkpoint.offset == offset
+
+    append(clippings_path, last_entry[20:])
+    assert parse(clippings_path, checkpoint) == parsed_clippings[3:4]
+
+
+def test_checkpoint_truncated_file(clippings_path, parsed_clippings):
+    checkpoint = Checkpoint()
+    parse(clippings_path, checkpoint)
+
+    clippings_path.write_text(as_kindle(parsed_clippings[:1]))
+    assert parse(clippings_path, checkpoint) == parsed_clippings[:1]
+    assert checkpoint.offset == end_offset(clippings_path)
+
+
+def test_checkpoint_rewritten_file(clippings_path, parsed_clippings):
+    checkpoint = Checkpoint()
+    parse(clippings_path, checkpoint)
+
+    rewritten_clippings = parsed_clippings[1:]
+    clippings_path.write_text(as_kindle(rewritten_clippings))
+    assert parse(clippings_path, checkpoint) == rewritten_clippings
+
+
+def test_checkpoint_in_memory_file(parsed_clippings):
+    kindle_bytes = as_kindle(parsed_clippings).encode("utf-8")
+    checkpoint = Checkpoint()
+    clippings = iter_clippings(io.BytesIO(kindle_bytes[:500]), checkpoint=checkpoint)
+    first_clippings = list(clippings)
+
+    clippings = iter_clippings(io.BytesIO(kindle_bytes), checkpoint=checkpoint)
+    assert first_clippings + list(clippings) == parsed_clippings
+
+
+def test_checkpoint_text_file():
+    with pytest.raises(TypeError):
+        list(iter_clippings(io.StringIO(""), checkpoint=Checkpoint()))
+
+
+def test_checkpoint_save_load(tmp_path):
+    path = tmp_path / "checkpoint.json"
+    assert Checkpoint.load(path) == Checkpoint()
+
+    checkpoint = Checkpoint(42, "abc")
+    checkpoint.save(path)
+    assert Checkpoint.load(path) == checkpoint
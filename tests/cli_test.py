@@ -1,8 +1,11 @@
+import json
 import sys
 from contextlib import contextmanager
 from unittest import mock
 from unittest.mock import patch
 
+import pytest
+
 from clippings.parser import main as parser_main
 
 
@@ -21,13 +24,23 @@ def cli_args(arg_list):
         yield
 
 
+def fake_write(string):
+    """Return a fake write function, that writes the string to the file."""
+
+    def write(clippings, fp):
+        fp.write(string)
+
+    return write
+
+
 def test_output_format_json(capsys):
-    with cli_args(["tests/resources/clippings.txt", "-o", "json"]), mock.patch(
-        "clippings.parser.as_json", return_value='{"j": "son"}'
-    ) as as_json_mock:
+    write_json_mock = mock.Mock(side_effect=fake_write('{"j": "son"}'))
+    with cli_args(["tests/resources/clippings.txt", "-o", "json"]), mock.patch.dict(
+        "clippings.parser.WRITE_FUNCTIONS", {"json": write_json_mock}
+    ):
         parser_main()
 
-    as_json_mock.assert_called_once()
+    write_json_mock.assert_called_once()
     assert capsys.readouterr().out == '{"j": "son"}'
 
 
@@ -42,20 +55,214 @@ def test_output_format_dict(capsys):
 
 
 def test_output_format_kindle(capsys):
-    with cli_args(["tests/resources/clippings.txt", "-o", "kindle"]), mock.patch(
-        "clippings.parser.as_kindle", return_value="kindle"
-    ) as as_kindle_mock:
+    write_kindle_mock = mock.Mock(side_effect=fake_write("kindle"))
+    with cli_args(["tests/resources/clippings.txt", "-o", "kindle"]), mock.patch.dict(
+        "clippings.parser.WRITE_FUNCTIONS", {"kindle": write_kindle_mock}
+    ):
         parser_main()
 
-    as_kindle_mock.assert_called_once()
+    write_kindle_mock.assert_called_once()
     assert capsys.readouterr().out == "kindle"
 
 
 def test_output_format_defaults_to_json(capsys):
-    with cli_args(["tests/resources/clippings.txt"]), mock.patch(
-        "clippings.parser.as_json", return_value='{"j": "son"}'
-    ) as as_json_mock:
+    write_json_mock = mock.Mock(side_effect=fake_write('{"j": "son"}'))
+    with cli_args(["tests/resources/clippings.txt"]), mock.patch.dict(
+        "clippings.parser.WRITE_FUNCTIONS", {"json": write_json_mock}
+    ):
         parser_main()
 
-    as_json_mock.assert_called_once()
+    write_json_mock.assert_called_once()
     assert capsys.readouterr().out == '{"j": "son"}'
+
+
+def test_jobs(capsys):
+    with cli_args(["tests/resources/clippings.txt", "-o", "kindle"]):
+        parser_main()
+    sequential_output = capsys.readouterr().out
+
+    with cli_args(["tests/resources/clippings.txt", "-o", "kindle", "--jobs", "2"]):
+        parser_main()
+
+    assert capsys.readouterr().out == sequential_output
+
+
+def test_output_to_file(tmp_path):
+    output_path = tmp_path / "clippings.txt"
+    with cli_args(["tests/resources/clippings.txt", "-o", "kindle", "-w", str(output_path)]):
+        parser_main()
+
+    with open("tests/resources/clippings.txt") as clippings_file:
+        assert output_path.read_text() == clippings_file.read()
+
+
+def test_output_format_jsonl(capsys):
+    write_jsonl_mock = mock.Mock(side_effect=fake_write('{"j": "son"}\n'))
+    with cli_args(["tests/resources/clippings.txt", "-o", "jsonl"]), mock.patch.dict(
+        "clippings.parser.WRITE_FUNCTIONS", {"jsonl": write_jsonl_mock}
+    ):
+        parser_main()
+
+    write_jsonl_mock.assert_called_once()
+    assert capsys.readouterr().out == '{"j": "son"}\n'
+
+
+def test_checkpoint(capsys, tmp_path):
+    checkpoint_path = tmp_path / "checkpoint.json"
+    clippings_args = ["tests/resources/clippings.txt", "-o", "jsonl"]
+    with cli_args(clippings_args + ["--checkpoint", str(checkpoint_path)]):
+        parser_main()
+
+    assert len(capsys.readouterr().out.splitlines()) == 5
+    assert checkpoint_path.exists()
+
+    with cli_args(clippings_args + ["--checkpoint", str(checkpoint_path)]):
+        parser_main()
+
+    assert capsys.readouterr().out == ""
+
+
+def test_cache_dir(capsys, tmp_path):
+    cache_dir = tmp_path / "cache"
+    with cli_args(["tests/resources/clippings.txt", "--cache-dir", str(cache_dir)]):
+        parser_main()
+
+    output = capsys.readouterr().out
+    assert len(list(cache_dir.iterdir())) == 1
+
+    with cli_args(["tests/resources/clippings.txt", "--cache-dir", str(cache_dir)]), mock.patch(
+        "clippings.parser._parse_entry"
+    ) as parse_entry_mock:
+        parser_main()
+
+    parse_entry_mock.assert_not_called()
+    assert capsys.readouterr().out == output
+
+
+def test_no_cache(capsys, tmp_path):
+    cache_dir = tmp_path / "cache"
+    with cli_args(["tests/resources/clippings.txt", "--no-cache"]), mock.patch.dict(
+        "os.environ", {"CLIPPINGS_CACHE_DIR": str(cache_dir)}
+    ):
+        parser_main()
+
+    assert not cache_dir.exists()
+
+
+def test_subcommand(tmp_path):
+    database_path = tmp_path / "clippings.db"
+    with cli_args(["sqlite", "tests/resources/clippings.txt", str(database_path)]):
+        parser_main()
+
+    assert database_path.exists()
+
+
+def test_dedupe(capsys, tmp_path):
+    with open("tests/resources/clippings.txt") as clippings_file:
+        content = clippings_file.read()
+    clippings_path = tmp_path / "clippings.txt"
+    clippings_path.write_text(content * 2)
+
+    with cli_args([str(clippings_path), "-o", "jsonl", "--dedupe"]):
+        parser_main()
+
+    # The highlights are deduplicated, but not the notes
+    categories = [
+        json.loads(line)["metadata"]["category"] for line in capsys.readouterr().out.splitlines()
+    ]
+    assert categories == ["Note", "Highlight", "Highlight", "Highlight", "Note", "Highlight"]
+
+
+def test_stats(capsys):
+    with open("tests/resources/clippings.txt") as clippings_file:
+        expected_output = clippings_file.read()
+
+    with cli_args(["tests/resources/clippings.txt", "-o", "kindle", "--stats"]):
+        parser_main()
+
+    captured = capsys.readouterr()
+    assert captured.out == expected_output
+    assert captured.err.startswith("Parsed 5 entries")
+    assert "Categories: Highlight: 4, Note: 1" in captured.err
+    for stage in ["split", "document", "metadata", "date", "serialize"]:
+        assert f"  {stage} " in captured.err
+
+
+def test_stats_multiple_jobs(capsys):
+    with cli_args(["tests/resources/clippings.txt", "--stats", "-j", "2"]):
+        with pytest.raises(SystemExit):
+            parser_main()
+
+    assert "--stats can't be used with more than one job" in capsys.readouterr().err
+
+
+@pytest.fixture(name="dirty_clippings_path")
+def fixture_dirty_clippings_path(tmp_path):
+    with open("tests/resources/clippings.txt") as clippings_file:
+        content = clippings_file.read()
+    clippings_path = tmp_path / "clippings.txt"
+    clippings_path.write_text(content + "Bad entry\n==========\n" + content)
+    return clippings_path
+
+
+def test_errors_raise(dirty_clippings_path):
+    with cli_args([str(dirty_clippings_path), "-o", "jsonl"]):
+        with pytest.raises(ValueError):
+            parser_main()
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_errors_skip(capsys, dirty_clippings_path, jobs):
+    with cli_args([str(dirty_clippings_path), "-o", "jsonl", "--errors", "skip", "-j", jobs]):
+        parser_main()
+
+    captured = capsys.readouterr()
+    assert len(captured.out.splitlines()) == 10
+    assert captured.err == ""
+
+
+def test_errors_collect(capsys, dirty_clippings_path):
+    with cli_args([str(dirty_clippings_path), "-o", "jsonl", "--errors", "collect"]):
+        parser_main()
+
+    captured = capsys.readouterr()
+    assert len(captured.out.splitlines()) == 10
+    assert "Entries that couldn't be parsed: 1" in captured.err
+    assert "ValueError: Incomplete entry" in captured.err
+
+
+def test_quarantine(capsys, tmp_path, dirty_clippings_path):
+    quarantine_path = tmp_path / "quarantine.jsonl"
+    with cli_args(
+        [str(dirty_clippings_path), "-o", "jsonl", "--quarantine", str(quarantine_path)]
+    ):
+        parser_main()
+
+    assert len(capsys.readouterr().out.splitlines()) == 10
+    failures = [json.loads(line) for line in quarantine_path.read_text().splitlines()]
+    assert len(failures) == 1
+    assert failures[0]["entry"].strip() == "Bad entry"
+    assert failures[0]["error"] == "ValueError"
+
+
+def test_keep_raw(capsys):
+    with open("tests/resources/clippings-new-format.txt") as clippings_file:
+        content = clippings_file.read().lstrip("\ufeff")
+
+    with cli_args(["tests/resources/clippings-new-format.txt", "-o", "kindle", "--keep-raw"]):
+        parser_main()
+
+    assert capsys.readouterr().out == content
+
+
+def test_keep_raw_crlf_and_bom(tmp_path):
+    with open("tests/resources/clippings-new-format.txt", "rb") as clippings_file:
+        content = b"\xef\xbb\xbf" + clippings_file.read().replace(b"\n", b"\r\n")
+    clippings_path = tmp_path / "My Clippings.txt"
+    clippings_path.write_bytes(content)
+    output_path = tmp_path / "output.txt"
+
+    with cli_args([str(clippings_path), "-o", "kindle", "--keep-raw", "-w", str(output_path)]):
+        parser_main()
+
+    assert output_path.read_bytes() == content
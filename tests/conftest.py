@@ -0,0 +1,26 @@
+"""Fixtures shared by the test modules."""
+
+import os.path
+
+import pytest
+
+from clippings.parser import parse_clippings
+
+TEST_RESOURCES_DIR = os.path.join("tests", "resources")
+
+
+@pytest.fixture(name="clippings_file_path")
+def fixture_clippings_file_path():
+    return os.path.join(TEST_RESOURCES_DIR, "clippings.txt")
+
+
+@pytest.fixture(name="clippings_bytes")
+def fixture_clippings_bytes(clippings_file_path):
+    with open(clippings_file_path, "rb") as clippings_file:
+        return clippings_file.read()
+
+
+@pytest.fixture(name="parsed_clippings")
+def fixture_parsed_clippings(clippings_file_path):
+    with open(clippings_file_path) as clippings_file:
+        return parse_clippings(clippings_file)
@@ -0,0 +1,113 @@
+import datetime
+
+import pytest
+
+from clippings.dedupe import dedupe_clippings
+from clippings.parser import Clipping
+from clippings.parser import Document
+from clippings.parser import Location
+from clippings.parser import Metadata
+
+DOCUMENT = Document("1984", "George Orwell")
+OTHER_DOCUMENT = Document("Animal Farm", "George Orwell")
+
+
+def make_clipping(begin, end, minute, content="", category="Highlight", document=DOCUMENT):
+    timestamp = datetime.datetime(2016, 9, 13, 7, minute)
+    return Clipping(document, Metadata(category, Location(begin, end), timestamp), content)
+
+
+def test_dedupe_no_overlap():
+    clippings = [make_clipping(1, 2, 0), make_clipping(3, 4, 1), make_clipping(10, 10, 2)]
+    assert dedupe_clippings(clippings) == clippings
+
+
+def test_dedupe_extended_highlight():
+    clippings = [
+        make_clipping(10, 12, 0, "It was a bright cold day"),
+        make_clipping(1, 2, 1, "Other"),
+        make_clipping(10, 14, 2, "It was a bright cold day in April"),
+    ]
+    assert dedupe_clippings(clippings) == clippings[1:]
+
+
+@pytest.mark.parametrize(
+    "keep, expected_index",
+    [
+        ("newest", 1),
+        ("longest", 0),
+    ],
+)
+def test_dedupe_keep_policy(keep, expected_index):
+    clippings = [make_clipping(10, 20, 0, "Long"), make_clipping(12, 14, 1, "Short")]
+    assert dedupe_clippings(clippings, keep=keep) == [clippings[expected_index]]
+
+
+def test_dedupe_chained_overlap():
+    # The second clipping is dropped for the third, so it doesn't drop the first
+    clippings = [make_clipping(1, 5, 0), make_clipping(3, 9, 1), make_clipping(8, 12, 2)]
+    assert dedupe_clippings(clippings) == [clippings[0], clippings[2]]
+
+
+def test_dedupe_overlaps_several_kept():
+    clippings = [
+        make_clipping(1, 5, 2),
+        make_clipping(5, 9, 1),
+        make_clipping(8, 12, 2),
+        make_clipping(3, 10, 0),
+    ]
+    assert dedupe_clippings(clippings) == [clippings[0], clippings[2]]
+
+
+def test_dedupe_shared_boundary():
+    clippings = [make_clipping(1, 5, 0), make_clipping(5, 9, 1), make_clipping(8, 12, 2)]
+    assert dedupe_clippings(clippings) == [clippings[0], clippings[2]]
+
+
+def test_dedupe_adjacent_highlights():
+    # Consecutive sentences share their boundary location
+    clippings = [make_clipping(begin, begin + 5, 0) for begin in range(100, 200, 5)]
+    assert dedupe_clippings(clippings) == clippings
+
+
+def test_dedupe_single_location_within_range():
+    clippings = [make_clipping(10, 12, 0), make_clipping(12, 12, 1)]
+    assert dedupe_clippings(clippings) == [clippings[1]]
+
+
+def test_dedupe_compares_with_kept_clipping():
+    # The last clipping overlaps the first one, but not the newer one kept
+    clippings = [make_clipping(1, 20, 0), make_clipping(2, 3, 1), make_clipping(15, 16, 2)]
+    assert dedupe_clippings(clippings) == clippings[1:]
+
+
+def test_dedupe_contained_range():
+    # The second clipping ends before the first, but the third still overlaps the first
+    clippings = [make_clipping(1, 20, 2), make_clipping(2, 3, 1), make_clipping(15, 16, 0)]
+    assert dedupe_clippings(clippings) == [clippings[0]]
+
+
+def test_dedupe_ties_keep_last():
+    clippings = [make_clipping(1, 5, 0), make_clipping(1, 5, 0)]
+    assert dedupe_clippings(clippings)[0] is clippings[1]
+
+
+def test_dedupe_by_document_and_category():
+    clippings = [
+        make_clipping(1, 5, 0),
+        make_clipping(1, 5, 1, document=OTHER_DOCUMENT),
+        make_clipping(1, 5, 2, category="Note"),
+        make_clipping(1, 5, 3, category="Note"),
+    ]
+    assert dedupe_clippings(clippings) == clippings
+    assert dedupe_clippings(clippings, categories=None) == [
+        clippings[0],
+        clippings[1],
+        clippings[3],
+    ]
+
+
+def test_dedupe_many_clippings():
+    clippings = [make_clipping(begin, begin + 1, 0) for begin in range(0, 30000, 3)]
+    clippings += [make_clipping(begin, begin + 2, 1) for begin in range(0, 30000, 3)]
+    assert dedupe_clippings(clippings) == clippings[10000:]
@@ -0,0 +1,14 @@
+"""Helpers shared by several test modules.
+
+Parsers are defined at the top level, so that they can be pickled for the
+process pool, and identified by the parse cache and memo.
+"""
+
+from clippings.parser import Document
+
+
+def parse_document_upper(line):
+    """Document parser that upper-cases the titles."""
+    document = Document.parse(line)
+    document.title = document.title.upper()
+    return document
@@ -0,0 +1,69 @@
+import datetime
+
+import pytest
+
+from clippings.index import ClippingIndex
+from clippings.parser import Document
+
+SCHOPENHAUER = Document(
+    "The Essays of Arthur Schopenhauer: the Wisdom of Life", "Schopenhauer, Arthur"
+)
+
+
+@pytest.fixture(name="index")
+def fixture_index(parsed_clippings):
+    return ClippingIndex(parsed_clippings)
+
+
+def test_index_len(index, parsed_clippings):
+    assert len(index) == len(parsed_clippings)
+    assert len(ClippingIndex()) == 0
+
+
+def test_documents_and_categories(index, parsed_clippings):
+    assert index.documents == [clipping.document for clipping in parsed_clippings[:4]]
+    assert index.categories == ["Highlight", "Note"]
+
+
+def test_by_document(index, parsed_clippings):
+    assert index.by_document(SCHOPENHAUER) == parsed_clippings[3:]
+    assert index.by_document(Document("Unknown")) == []
+
+
+def test_by_category(index, parsed_clippings):
+    assert index.by_category("Note") == [parsed_clippings[3]]
+    assert index.by_category("Highlight") == parsed_clippings[:3] + parsed_clippings[4:]
+    assert index.by_category("Bookmark") == []
+
+
+def test_between(index, parsed_clippings):
+    since = datetime.datetime(2016, 7, 14, 23, 35, 52)
+    until = datetime.datetime(2016, 9, 13, 7, 29, 9)
+    assert index.between(since, until) == parsed_clippings[1:3]
+    assert index.between(since=since) == parsed_clippings[1:]
+    assert index.between(until=until) == parsed_clippings[:3]
+    assert index.between() == parsed_clippings
+
+
+def test_between_sorts_by_timestamp(parsed_clippings):
+    index = ClippingIndex(reversed(parsed_clippings))
+    timestamps = [clipping.metadata.timestamp for clipping in index.between()]
+    assert timestamps == sorted(timestamps)
+
+
+def test_in_document(parsed_clippings):
+    document = parsed_clippings[0].document
+    clippings = [
+        parsed_clippings[0],
+        parsed_clippings[1],
+        parsed_clippings[2],
+    ]
+    for clipping, begin in zip(clippings, [30, 10, 20]):
+        clipping.document = document
+        clipping.metadata.location.begin = begin
+    index = ClippingIndex(clippings)
+
+    assert index.in_document(document) == [clippings[1], clippings[2], clippings[0]]
+    assert index.in_document(document, start=15) == [clippings[2], clippings[0]]
+    assert index.in_document(document, start=15, stop=30) == [clippings[2]]
+    assert index.in_document(Document("Unknown")) == []
@@ -0,0 +1,142 @@
+import datetime
+import os.path
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from clippings import languages
+from clippings.languages import ENGLISH
+from clippings.languages import SPANISH
+from clippings.languages import LanguageProfile
+from clippings.languages import detect_language
+from clippings.languages import parse_metadata
+from clippings.languages import register_language
+from clippings.languages import timestamp_parser
+from clippings.parser import Location
+from clippings.parser import Metadata
+from clippings.parser import parse_clippings
+
+TEST_RESOURCES_DIR = os.path.join("tests", "resources")
+
+SPANISH_LINE = (
+    "- La subrayado en la página 4 | posición 60-60 | "
+    "Añadido el miércoles, 6 de julio de 2022 06:54:57"
+)
+ENGLISH_LINE = (
+    "- Your Highlight on page 115 | location 1756-1757 | "
+    "Added on Friday, 26 February 2021 11:03:02"
+)
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        (
+            ENGLISH_LINE,
+            Metadata(
+                "Highlight", Location(1756, 1757), datetime.datetime(2021, 2, 26, 11, 3, 2), 115
+            ),
+        ),
+        (
+            "- Your Note on Location 20 | Added on Tuesday, September 13, 2016 7:29:09 AM",
+            Metadata("Note", Location(20, 20), datetime.datetime(2016, 9, 13, 7, 29, 9)),
+        ),
+        (
+            SPANISH_LINE,
+            Metadata("Highlight", Location(60, 60), datetime.datetime(2022, 7, 6, 6, 54, 57), 4),
+        ),
+        (
+            "- Tu nota en la posición 1024 | Añadido el sábado, 1 de enero de 2022 23:05:00",
+            Metadata("Note", Location(1024, 1024), datetime.datetime(2022, 1, 1, 23, 5, 0)),
+        ),
+        (
+            "- El marcador en la posición 7 | Añadido el domingo, 18 de setiembre de 2022 8:00:01",
+            Metadata("Bookmark", Location(7, 7), datetime.datetime(2022, 9, 18, 8, 0, 1)),
+        ),
+    ],
+)
+def test_parse_metadata(line, expected):
+    assert parse_metadata(line) == expected
+
+
+def test_parse_metadata_same_as_english_parser():
+    line = "- Your Highlight on page 311 | Location 4769-4770 | Added on Monday, March 21, 2016 8:35:16 AM"  # noqa: E501
+    assert parse_metadata(line) == Metadata.parse(line)
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        (ENGLISH_LINE, ENGLISH),
+        (SPANISH_LINE, SPANISH),
+        ("- Ihre Markierung bei Position 12", None),
+        ("", None),
+    ],
+)
+def test_detect_language(line, expected):
+    assert detect_language(line) is expected
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "- Ihre Markierung bei Position 12 | Hinzugefügt am Freitag, 26. Februar 2021 11:03:02",
+        "- Your Highlight on Location 12",
+        "- La subrayado en la posición 60 | Añadido el miércoles, 6 de juillet de 2022 06:54:57",
+        "- La subrayado en la posición 60 | Añadido el mercredi, 6 de julio de 2022 06:54:57",
+        "- La subrayado en la posición 60 | Añadido el 6/7/2022 06:54:57",
+    ],
+)
+def test_parse_metadata_invalid(line):
+    with pytest.raises(ValueError):
+        parse_metadata(line)
+
+
+def test_register_language(monkeypatch):
+    monkeypatch.setattr(languages, "LANGUAGES", dict(languages.LANGUAGES))
+    monkeypatch.setattr(
+        languages, "_LANGUAGES_BY_FIRST_WORD", dict(languages._LANGUAGES_BY_FIRST_WORD)
+    )
+    german = LanguageProfile(
+        code="de",
+        first_words=["Ihre"],
+        pattern=(
+            r"^- Ihre (?P<category>\w+) bei Position (?P<location>\d+(?:-\d+)?) \| "
+            r"Hinzugefügt am (?P<timestamp>.+)$"
+        ),
+        categories={"markierung": "Highlight"},
+        parse_timestamp=timestamp_parser(
+            r"^(?P<weekday>\w+), (?P<day>\d{1,2})\. (?P<month>\w+) (?P<year>\d{4}) "
+            r"(?P<hour>\d{1,2}):(?P<minute>\d{2}):(?P<second>\d{2})$",
+            months={"februar": 2},
+            weekdays={"freitag"},
+        ),
+    )
+    register_language(german)
+    metadata = parse_metadata(
+        "- Ihre Markierung bei Position 12 | Hinzugefügt am Freitag, 26. Februar 2021 11:03:02"
+    )
+
+    assert languages.LANGUAGES["de"] is german
+    assert metadata == Metadata(
+        "Highlight", Location(12, 12), datetime.datetime(2021, 2, 26, 11, 3, 2)
+    )
+
+
+def test_parse_bilingual_clippings():
+    with open(os.path.join(TEST_RESOURCES_DIR, "clippings-bilingual.txt"), "rb") as clippings_file:
+        clippings = parse_clippings(clippings_file, metadata_parser=parse_metadata)
+
+    assert [clipping.document.title for clipping in clippings] == [
+        "The Priory of the Orange Tree",
+        "El Principe de la Niebla",
+    ]
+    assert [clipping.metadata.category for clipping in clippings] == ["Highlight", "Highlight"]
+    assert clippings[1].metadata.timestamp == datetime.datetime(2022, 7, 6, 6, 54, 57)
+
+
+def test_parse_metadata_in_threads():
+    lines = [ENGLISH_LINE, SPANISH_LINE] * 500
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(parse_metadata, lines))
+    assert results == [parse_metadata(line) for line in lines]
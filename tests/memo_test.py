@@ -0,0 +1,102 @@
+import io
+from unittest import mock
+
+import pytest
+
+import clippings.parser
+from clippings.memo import EntryMemo
+from clippings.parser import Document
+from clippings.parser import Metadata
+from clippings.parser import as_kindle
+from clippings.parser import parse_clippings
+from tests.helpers import parse_document_upper
+
+
+def memo_parse(text, memo, **kwargs):
+    return parse_clippings(io.BytesIO(text.encode("utf-8")), memo=memo, **kwargs)
+
+
+def test_memo_reuses_entries(parsed_clippings):
+    memo = EntryMemo()
+    assert memo_parse(as_kindle(parsed_clippings[:3]), memo) == parsed_clippings[:3]
+    assert (memo.hits, memo.misses, len(memo)) == (0, 3, 3)
+
+    # Another copy of the file, with an entry deleted and new ones
+    other_clippings = parsed_clippings[1:]
+    with mock.patch(
+        "clippings.parser._parse_entry", wraps=clippings.parser._parse_entry
+    ) as parse_entry_mock:
+        assert memo_parse(as_kindle(other_clippings), memo) == other_clippings
+
+    assert parse_entry_mock.call_count == 2
+    assert (memo.hits, memo.misses, len(memo)) == (2, 5, 5)
+    assert memo.hit_rate == 2 / 7
+
+
+def test_memo_key_ignores_surrounding_whitespace():
+    entry = "Title\n- Metadata\n\nContent"
+    assert EntryMemo.key(entry) == EntryMemo.key(f"\n{entry}\n")
+    assert EntryMemo.key(entry) == EntryMemo.key(entry.encode("utf-8"))
+    assert EntryMemo.key(entry) != EntryMemo.key(entry + ".")
+
+
+def test_memo_key_parsers(parsed_clippings):
+    memo = EntryMemo()
+    text = as_kindle(parsed_clippings)
+    memo_parse(text, memo)
+    clippings = memo_parse(text, memo, document_parser=parse_document_upper)
+
+    assert clippings[0].document.title == "JAVA CONCURRENCY IN PRACTICE"
+    assert memo.hits == 0
+    assert EntryMemo.namespace(Document.parse, Metadata.parse) != EntryMemo.namespace(
+        parse_document_upper, Metadata.parse
+    )
+    assert EntryMemo.namespace(Document.parse, Metadata.parse) != EntryMemo.namespace(
+        Document.parse, Metadata.parse, keep_raw=True
+    )
+
+
+def test_memo_key_version():
+    namespace = EntryMemo.namespace(Document.parse, Metadata.parse)
+    with mock.patch("clippings.memo.__version__", "0.0.0"):
+        assert EntryMemo.namespace(Document.parse, Metadata.parse) != namespace
+
+
+def test_memo_bounded(parsed_clippings):
+    memo = EntryMemo(max_entries=2)
+    memo_parse(as_kindle(parsed_clippings[:3]), memo)
+    assert len(memo) == 2
+
+    memo_parse(as_kindle(parsed_clippings[1:3]), memo)
+    assert memo.hits == 2
+
+
+def test_memo_save_load(parsed_clippings, tmp_path):
+    path = tmp_path / "memo.pickle"
+    memo = EntryMemo(path)
+    memo_parse(as_kindle(parsed_clippings), memo)
+    memo.save()
+
+    loaded_memo = EntryMemo(path)
+    assert len(loaded_memo) == len(parsed_clippings)
+    assert memo_parse(as_kindle(parsed_clippings), loaded_memo) == parsed_clippings
+    assert loaded_memo.hit_rate == 1
+
+
+@pytest.mark.parametrize("content", [b"", b"garbage"])
+def test_memo_corrupt_file(parsed_clippings, tmp_path, content):
+    path = tmp_path / "memo.pickle"
+    path.write_bytes(content)
+    memo = EntryMemo(path)
+    assert len(memo) == 0
+    assert memo_parse(as_kindle(parsed_clippings), memo) == parsed_clippings
+
+    memo.save()
+    assert len(EntryMemo(path)) == len(parsed_clippings)
+
+
+def test_memo_lazy_or_workers():
+    with pytest.raises(ValueError):
+        memo_parse("", EntryMemo(), lazy=True)
+    with pytest.raises(ValueError):
+        memo_parse("", EntryMemo(), workers=2)
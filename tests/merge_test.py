@@ -0,0 +1,53 @@
+import io
+
+from clippings.merge import main as merge_main
+from clippings.merge import merge_clippings
+from clippings.parser import as_kindle
+
+
+def as_file(clippings):
+    return io.BytesIO(as_kindle(clippings).encode("utf-8"))
+
+
+def test_merge_interleaved(parsed_clippings):
+    first_device = [parsed_clippings[index] for index in (0, 2, 3)]
+    second_device = [parsed_clippings[index] for index in (1, 4)]
+    merged_clippings = merge_clippings(as_file(first_device), as_file(second_device))
+    assert list(merged_clippings) == parsed_clippings
+
+
+def test_merge_drops_duplicates(parsed_clippings):
+    merged_clippings = merge_clippings(
+        as_file(parsed_clippings[:4]),
+        as_file(parsed_clippings[2:]),
+        as_file(parsed_clippings),
+    )
+    assert list(merged_clippings) == parsed_clippings
+
+
+def test_merge_keeps_distinct_clippings_with_same_timestamp(parsed_clippings):
+    # The last two clippings have the same timestamp
+    merged_clippings = merge_clippings(
+        as_file(parsed_clippings[3:4]), as_file(parsed_clippings[4:5])
+    )
+    assert list(merged_clippings) == parsed_clippings[3:5]
+
+
+def test_merge_is_lazy(parsed_clippings):
+    merged_clippings = merge_clippings(as_file(parsed_clippings), io.BytesIO(b"Not parsed"))
+    assert next(merged_clippings) == parsed_clippings[0]
+
+
+def test_merge_no_files():
+    assert list(merge_clippings()) == []
+
+
+def test_main(capsys, tmp_path, parsed_clippings):
+    paths = []
+    for name, clippings in [("a.txt", parsed_clippings[:3]), ("b.txt", parsed_clippings[1:])]:
+        path = tmp_path / name
+        path.write_text(as_kindle(clippings))
+        paths.append(str(path))
+
+    merge_main(paths)
+    assert capsys.readouterr().out == as_kindle(parsed_clippings)
@@ -1,19 +1,32 @@
 import datetime
+import io
 import json
 import os.path
 from copy import deepcopy
+from unittest import mock
 from unittest.mock import Mock
 
 import pytest
 
+from clippings.memo import EntryMemo
 from clippings.parser import Clipping
 from clippings.parser import Document
+from clippings.parser import EntryFailure
+from clippings.parser import LazyClipping
 from clippings.parser import Location
 from clippings.parser import Metadata
 from clippings.parser import as_dicts
 from clippings.parser import as_json
+from clippings.parser import as_jsonl
 from clippings.parser import as_kindle
+from clippings.parser import iter_clippings
 from clippings.parser import parse_clippings
+from clippings.parser import write_json
+from clippings.parser import write_jsonl
+from clippings.parser import write_kindle
+from clippings.stats import ParseStats
+from clippings.utils import DatetimeJSONEncoder
+from tests.helpers import parse_document_upper
 
 TEST_RESOURCES_DIR = os.path.join("tests", "resources")
 
@@ -499,3 +512,395 @@ def test_parse_clippings_file_new_format_to_dict(parsed_clippings):
     actual_results = as_json(parsed_clippings)
     actual_results = json.loads(actual_results)
     assert actual_results == expected_results
+
+
+def test_iter_clippings_is_lazy(clippings_filename):
+    clippings_file_path = os.path.join(TEST_RESOURCES_DIR, clippings_filename)
+    with open(clippings_file_path) as clippings_file:
+        clippings = iter_clippings(clippings_file)
+        first_clipping = next(clippings)
+        assert not clippings_file.closed
+
+    assert first_clipping.document.title == "Java Concurrency in Practice"
+
+
+# Small chunks make the separator straddle chunk boundaries
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 11, 4096])
+def test_iter_clippings_chunk_size(parsed_clippings, clippings_filename, chunk_size):
+    clippings_file_path = os.path.join(TEST_RESOURCES_DIR, clippings_filename)
+    with open(clippings_file_path) as clippings_file:
+        clippings = list(iter_clippings(clippings_file, chunk_size=chunk_size))
+
+    assert clippings == parsed_clippings
+
+
+def test_iter_clippings_ignores_incomplete_last_entry(parsed_clippings):
+    clippings_file = io.StringIO(as_kindle(parsed_clippings) + "Incomplete (Entry)\n")
+    assert list(iter_clippings(clippings_file)) == parsed_clippings
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "- Your Highlight somewhere",
+        "Java Concurrency in Practice (Joshua Bloch)",
+        "",
+    ],
+)
+def test_parse_metadata_invalid(line):
+    with pytest.raises(ValueError, match="Invalid metadata line"):
+        Metadata.parse(line)
+
+
+BAD_ENTRIES = [
+    "Title without metadata\n",
+    "Title (Author)\n- Your Highlight somewhere\n\nContent\n",
+    "Title (Author)\n- Your Note on Location 1 | Added on not a date\n\nContent\n",
+]
+
+
+@pytest.fixture(name="dirty_clippings")
+def fixture_dirty_clippings(parsed_clippings):
+    """Return the text of a clippings file with bad entries among good ones,
+    and the offsets (in bytes) of the bad entries.
+    """
+    good_entries = [as_kindle([clipping]) for clipping in parsed_clippings]
+    text = good_entries[0]
+    offsets = []
+    for bad_entry, good_entry in zip(BAD_ENTRIES, good_entries[1:]):
+        # Entries start right after the previous separator, before its line break
+        offsets.append(len(text.encode("utf-8")) - 1)
+        text += f"{bad_entry}==========\n{good_entry}"
+    return text, offsets
+
+
+def test_parse_clippings_errors_raise(dirty_clippings):
+    text, _ = dirty_clippings
+    with pytest.raises(ValueError, match="Incomplete entry"):
+        parse_clippings(io.StringIO(text))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_clippings_errors_skip(parsed_clippings, dirty_clippings, workers):
+    text, _ = dirty_clippings
+    clippings = parse_clippings(io.StringIO(text), errors="skip", workers=workers)
+    assert clippings == parsed_clippings[:4]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_clippings_errors_collect(parsed_clippings, dirty_clippings, workers):
+    text, offsets = dirty_clippings
+    failures = []
+    clippings = parse_clippings(
+        io.BytesIO(text.encode("utf-8")), errors="collect", failures=failures, workers=workers
+    )
+
+    assert clippings == parsed_clippings[:4]
+    assert [failure.offset for failure in failures] == offsets
+    assert [failure.entry.decode("utf-8") for failure in failures] == [
+        f"\n{bad_entry}" for bad_entry in BAD_ENTRIES
+    ]
+    assert all(isinstance(failure.exception, ValueError) for failure in failures)
+
+
+def test_iter_clippings_errors_collect_memo(parsed_clippings, dirty_clippings):
+    text, _ = dirty_clippings
+    failures = []
+    clippings = iter_clippings(
+        io.StringIO(text), errors="collect", failures=failures, memo=EntryMemo()
+    )
+    assert list(clippings) == parsed_clippings[:4]
+    assert len(failures) == 3
+
+
+def test_iter_clippings_errors_collect_stats(parsed_clippings, dirty_clippings):
+    text, _ = dirty_clippings
+    failures = []
+    stats = ParseStats()
+    clippings = iter_clippings(io.StringIO(text), errors="collect", failures=failures, stats=stats)
+    assert list(clippings) == parsed_clippings[:4]
+    assert len(failures) == 3
+    assert stats.entries == 4
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"errors": "ignore"},
+        {"errors": "collect"},  # Without a failures list
+        {"errors": "skip", "lazy": True},
+    ],
+)
+def test_parse_clippings_errors_invalid_options(kwargs):
+    with pytest.raises(ValueError):
+        parse_clippings(io.StringIO(""), **kwargs)
+
+
+def test_entry_failure_to_dict():
+    failure = EntryFailure(12, b"Bad \xff entry", ValueError("Invalid"))
+    assert failure.to_dict() == {
+        "offset": 12,
+        "entry": "Bad \ufffd entry",
+        "error": "ValueError",
+        "message": "Invalid",
+    }
+    assert str(failure) == "Entry at offset 12: ValueError: Invalid"
+
+
+@pytest.fixture(name="new_format_text")
+def fixture_new_format_text():
+    """Return the text of a clippings file that isn't in the format written by
+    `as_kindle` (e.g. "Page" rather than "page", and 24-hour timestamps).
+    """
+    with open(os.path.join(TEST_RESOURCES_DIR, "clippings-new-format.txt")) as clippings_file:
+        return clippings_file.read().lstrip("\ufeff")
+
+
+def test_keep_raw_round_trip(new_format_text):
+    clippings = parse_clippings(io.StringIO(new_format_text))
+    assert as_kindle(clippings) != new_format_text
+
+    raw_clippings = parse_clippings(io.StringIO(new_format_text), keep_raw=True)
+    assert as_kindle(raw_clippings) == new_format_text
+    assert raw_clippings == clippings
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_keep_raw_workers(new_format_text, workers):
+    clippings_file = io.BytesIO(new_format_text.encode("utf-8"))
+    clippings = parse_clippings(clippings_file, keep_raw=True, workers=workers)
+    assert as_kindle(clippings) == new_format_text
+
+
+def test_keep_raw_memo_and_stats(new_format_text):
+    memo = EntryMemo()
+    for options in [{"memo": memo}, {"memo": memo}, {"stats": ParseStats()}]:
+        clippings = parse_clippings(io.StringIO(new_format_text), keep_raw=True, **options)
+        assert as_kindle(clippings) == new_format_text
+    assert memo.hits == len(clippings)
+
+
+def test_keep_raw_modified(new_format_text):
+    clipping = parse_clippings(io.StringIO(new_format_text), keep_raw=True)[0]
+    document_line, metadata_line = new_format_text.splitlines()[:2]
+    assert str(clipping.document) == document_line
+    assert str(clipping.metadata) == metadata_line
+
+    clipping.document.authors = "Anonymous"
+    clipping.metadata.location.end += 1
+    assert str(clipping.document) == (
+        "God's Bankers: A History of Money and Power at the Vatican (Anonymous)"
+    )
+    assert str(clipping.metadata) == (
+        "- Your Highlight on page 10 | Location 140-143 | "
+        "Added on Saturday, September 15, 2012 7:55:46 AM"
+    )
+
+    clipping.document.authors = "Gerald Posner"
+    clipping.metadata.location.end -= 1
+    assert str(clipping.document) == document_line
+    assert str(clipping.metadata) == metadata_line
+
+
+@pytest.mark.parametrize("options", [{}, {"workers": 2}, {"memo": EntryMemo()}])
+def test_keep_raw_crlf_and_bom(new_format_text, options):
+    # Like Kindle files: CRLF line endings, and byte order marks before titles
+    crlf_text = "\ufeff" + new_format_text.replace("\n", "\r\n").replace(
+        "==========\r\n", "==========\r\n\ufeff", 1
+    )
+    crlf_bytes = crlf_text.encode("utf-8")
+    clippings = parse_clippings(io.BytesIO(crlf_bytes), keep_raw=True, **options)
+    assert as_kindle(clippings).encode("utf-8") == crlf_bytes
+    assert clippings == parse_clippings(io.StringIO(new_format_text))
+
+    clippings[0].content += "\n!"
+    assert as_kindle(clippings[:1]).endswith("\r\n!\r\n==========\r\n")
+
+
+def test_keep_raw_stats_crlf(new_format_text):
+    crlf_bytes = new_format_text.replace("\n", "\r\n").encode("utf-8")
+    clippings = parse_clippings(io.BytesIO(crlf_bytes), keep_raw=True, stats=ParseStats())
+    assert as_kindle(clippings).encode("utf-8") == crlf_bytes
+
+
+def test_keep_raw_lazy():
+    with pytest.raises(ValueError):
+        parse_clippings(io.StringIO(""), keep_raw=True, lazy=True)
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 1000])
+def test_parse_clippings_workers(parsed_clippings, clippings_filename, batch_size):
+    clippings_file_path = os.path.join(TEST_RESOURCES_DIR, clippings_filename)
+    with open(clippings_file_path) as clippings_file, mock.patch(
+        "clippings.parser.BATCH_SIZE", batch_size
+    ):
+        clippings = parse_clippings(clippings_file, workers=2)
+
+    assert clippings == parsed_clippings
+
+
+def test_parse_clippings_workers_parser_params(clippings_filename):
+    clippings_file_path = os.path.join(TEST_RESOURCES_DIR, clippings_filename)
+    with open(clippings_file_path) as clippings_file:
+        clippings = parse_clippings(
+            clippings_file, document_parser=parse_document_upper, workers=2
+        )
+
+    assert clippings[0].document.title == "JAVA CONCURRENCY IN PRACTICE"
+
+
+def test_parse_clippings_binary_file(parsed_clippings, clippings_filename):
+    clippings_file_path = os.path.join(TEST_RESOURCES_DIR, clippings_filename)
+    with open(clippings_file_path, "rb") as clippings_file:
+        clippings = parse_clippings(clippings_file)
+
+    assert clippings == parsed_clippings
+
+
+@pytest.mark.parametrize("chunk_size", [3, 4096])
+def test_parse_clippings_binary_stream_bom_crlf(parsed_clippings, chunk_size):
+    kindle_text = as_kindle(parsed_clippings).replace("\n", "\r\n")
+    kindle_bytes = ("\ufeff" + kindle_text).encode("utf-8")
+    clippings = iter_clippings(io.BytesIO(kindle_bytes), chunk_size=chunk_size)
+
+    assert list(clippings) == parsed_clippings
+
+
+def test_parse_clippings_mapped_file_bom_crlf(parsed_clippings, tmp_path):
+    kindle_text = as_kindle(parsed_clippings).replace("\n", "\r\n")
+    clippings_file_path = tmp_path / "clippings.txt"
+    clippings_file_path.write_bytes(("\ufeff" + kindle_text).encode("utf-8"))
+
+    with open(clippings_file_path, "rb") as clippings_file:
+        clippings = parse_clippings(clippings_file)
+
+    assert clippings == parsed_clippings
+
+
+@pytest.fixture(name="lazy_clippings")
+def fixture_lazy_clippings(clippings_filename):
+    clippings_file_path = os.path.join(TEST_RESOURCES_DIR, clippings_filename)
+    with open(clippings_file_path, "rb") as clippings_file:
+        return parse_clippings(clippings_file, lazy=True)
+
+
+def test_lazy_clippings_parse_on_access(clippings_filename):
+    clippings_file_path = os.path.join(TEST_RESOURCES_DIR, clippings_filename)
+    metadata_parser = Mock(side_effect=Metadata.parse)
+    with open(clippings_file_path) as clippings_file:
+        clippings = parse_clippings(clippings_file, metadata_parser=metadata_parser, lazy=True)
+
+    assert all(isinstance(clipping, LazyClipping) for clipping in clippings)
+    assert clippings[0].document.title == "Java Concurrency in Practice"
+    assert clippings[0].content.startswith("Avoid the temptation")
+    metadata_parser.assert_not_called()
+
+    assert clippings[0].metadata.page == 311
+    assert clippings[0].metadata.page == 311
+    metadata_parser.assert_called_once()
+
+
+def test_lazy_clippings_equality(lazy_clippings, parsed_clippings):
+    assert lazy_clippings == parsed_clippings
+    assert parsed_clippings == lazy_clippings
+    assert lazy_clippings[0] != parsed_clippings[1]
+    assert parsed_clippings[1] != lazy_clippings[0]
+
+
+def test_lazy_clippings_serialization(lazy_clippings, parsed_clippings):
+    assert as_dicts(lazy_clippings) == as_dicts(parsed_clippings)
+    assert as_json(lazy_clippings) == as_json(parsed_clippings)
+    assert as_kindle(lazy_clippings) == as_kindle(parsed_clippings)
+
+
+def test_lazy_clipping_set_attribute(lazy_clippings):
+    lazy_clippings[0].content = "New content"
+    assert lazy_clippings[0].content == "New content"
+    assert lazy_clippings[0].document.title == "Java Concurrency in Practice"
+
+
+def test_lazy_clippings_workers(clippings_filename):
+    clippings_file_path = os.path.join(TEST_RESOURCES_DIR, clippings_filename)
+    with open(clippings_file_path) as clippings_file, pytest.raises(ValueError):
+        parse_clippings(clippings_file, workers=2, lazy=True)
+
+
+def test_hash_equal_objects(parsed_clippings, lazy_clippings):
+    for clipping, lazy_clipping in zip(parsed_clippings, lazy_clippings):
+        assert hash(clipping) == hash(lazy_clipping)
+        assert hash(clipping.document) == hash(Document(**clipping.document.to_dict()))
+        assert hash(clipping.metadata.location) == hash(
+            Location(**clipping.metadata.location.to_dict())
+        )
+
+
+def test_objects_in_sets(parsed_clippings, lazy_clippings):
+    assert set(parsed_clippings) == set(lazy_clippings)
+    assert len(set(parsed_clippings)) == len(parsed_clippings)
+    documents = {clipping.document for clipping in parsed_clippings}
+    assert len(documents) == 4
+
+
+@pytest.mark.parametrize("cls", [Document, Location, Metadata, Clipping])
+def test_objects_have_no_attributes_dict(cls):
+    assert not hasattr(cls.__new__(cls), "__dict__")
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 1000])
+def test_write_kindle(parsed_clippings, batch_size):
+    output = io.StringIO()
+    with mock.patch("clippings.parser.WRITE_BATCH_SIZE", batch_size):
+        write_kindle(iter(parsed_clippings), output)
+
+    assert output.getvalue() == as_kindle(parsed_clippings)
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 1000])
+def test_write_json(parsed_clippings, batch_size):
+    output = io.StringIO()
+    with mock.patch("clippings.parser.WRITE_BATCH_SIZE", batch_size):
+        write_json(iter(parsed_clippings), output)
+
+    expected_json = json.dumps(as_dicts(parsed_clippings), cls=DatetimeJSONEncoder)
+    assert output.getvalue() == expected_json
+
+
+def test_write_json_empty():
+    output = io.StringIO()
+    write_json(iter([]), output)
+    assert output.getvalue() == "[]"
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 1000])
+def test_write_jsonl(parsed_clippings, batch_size):
+    output = io.StringIO()
+    with mock.patch("clippings.parser.WRITE_BATCH_SIZE", batch_size):
+        write_jsonl(iter(parsed_clippings), output)
+
+    lines = output.getvalue().splitlines(keepends=True)
+    assert len(lines) == len(parsed_clippings)
+    for line, clipping in zip(lines, parsed_clippings):
+        assert line == json.dumps(clipping.to_dict(), cls=DatetimeJSONEncoder) + "\n"
+
+
+def test_as_jsonl_escaping(clipping, content):
+    clipping.document.title = 'The "Title"\n'
+    clipping.content = "Ünïcödé"
+    expected_line = json.dumps(clipping.to_dict(), cls=DatetimeJSONEncoder) + "\n"
+    assert as_jsonl([clipping]) == expected_line
+    assert json.loads(expected_line)["content"] == "Ünïcödé"
+
+
+@pytest.mark.parametrize(
+    "attribute, value",
+    [
+        ("page", "95"),
+        ("category", 1),
+        ("timestamp", "2016-09-13"),
+    ],
+)
+def test_as_jsonl_non_standard_types(clipping, attribute, value):
+    setattr(clipping.metadata, attribute, value)
+    clipping.content = "Some content"
+    expected_line = json.dumps(clipping.to_dict(), cls=DatetimeJSONEncoder) + "\n"
+    assert as_jsonl([clipping]) == expected_line
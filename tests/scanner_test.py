@@ -0,0 +1,110 @@
+import gzip
+import io
+
+import pytest
+
+from clippings import scanner
+
+TEXT = "First\n==========\nSecond\n==========\nIncomplete"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 5, 1000])
+def test_iter_stream_entries_text(chunk_size):
+    entries = list(scanner.iter_stream_entries(io.StringIO(TEXT), "==========", chunk_size))
+    assert entries == [(0, "First\n"), (16, "\nSecond\n")]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 5, 1000])
+def test_iter_stream_entries_binary(chunk_size):
+    stream = io.BytesIO(TEXT.encode())
+    entries = list(scanner.iter_stream_entries(stream, b"==========", chunk_size))
+    assert entries == [(0, b"First\n"), (16, b"\nSecond\n")]
+
+
+def test_entry_splitter():
+    splitter = scanner.EntrySplitter("==========", start=3)
+    assert splitter.feed("First\n=====") == []
+    assert splitter.feed("=====\nSecond\n==========\nThird\n==") == [
+        (3, "First\n"),
+        (19, "\nSecond\n"),
+    ]
+    assert splitter.feed("========\nIncomplete") == [(37, "\nThird\n")]
+
+
+def test_iter_buffer_entries():
+    entries = list(scanner.iter_buffer_entries(TEXT.encode(), b"=========="))
+    assert entries == [(0, b"First\n"), (16, b"\nSecond\n")]
+
+
+def test_iter_buffer_entries_start():
+    entries = list(scanner.iter_buffer_entries(TEXT.encode(), b"==========", start=16))
+    assert entries == [(16, b"\nSecond\n")]
+
+
+def test_mapped(tmp_path):
+    path = tmp_path / "clippings.txt"
+    path.write_bytes(TEXT.encode())
+    with open(path, "rb") as clippings_file, scanner.mapped(clippings_file) as buffer:
+        assert buffer[:] == TEXT.encode()
+
+
+def test_mapped_empty_file(tmp_path):
+    path = tmp_path / "clippings.txt"
+    path.write_bytes(b"")
+    with open(path, "rb") as clippings_file, scanner.mapped(clippings_file) as buffer:
+        assert buffer is None
+
+
+def test_mapped_not_a_regular_file(tmp_path):
+    path = tmp_path / "clippings.txt.gz"
+    with gzip.open(path, "wb") as gzip_file:
+        gzip_file.write(TEXT.encode())
+
+    with gzip.open(path, "rb") as gzip_file, scanner.mapped(gzip_file) as buffer:
+        assert buffer is None
+
+    with scanner.mapped(io.BytesIO(TEXT.encode())) as buffer:
+        assert buffer is None
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        "\nTitle\n- Metadata\n\nContent\n",
+        "\r\nTitle\r\n- Metadata\r\n\r\nContent\r\n",
+        "\n\ufeffTitle\n- Metadata\n\nContent\n",
+        "\ufeffTitle\r\n- Metadata\r\n\r\nContent\r\n",
+    ],
+)
+def test_split_entry(entry):
+    expected_lines = ["Title", "- Metadata", "", "Content"]
+    assert scanner.split_entry(entry) == expected_lines
+    assert scanner.split_entry(entry.encode("utf-8")) == expected_lines
+
+
+@pytest.mark.parametrize("whitespace", ["\xa0", "\u3000", "\u2028"])
+def test_split_entry_unicode_whitespace(whitespace):
+    # Stripped from binary entries too, like from text ones
+    entry = f"\nTitle\n- Metadata\n\nContent{whitespace}\n"
+    expected_lines = ["Title", "- Metadata", "", "Content"]
+    assert scanner.split_entry(entry) == expected_lines
+    assert scanner.split_entry(entry.encode("utf-8")) == expected_lines
+
+
+def test_split_entry_keep_bom():
+    entry = "\r\n\ufeffTitle\r\n- Metadata\r\n\r\nContent\r\n"
+    expected_lines = ["\ufeffTitle", "- Metadata", "", "Content"]
+    assert scanner.split_entry(entry, keep_bom=True) == expected_lines
+    assert scanner.split_entry(entry.encode("utf-8"), keep_bom=True) == expected_lines
+
+
+@pytest.mark.parametrize(
+    "entry, newline",
+    [
+        ("\nTitle\n- Metadata\n\nContent\n", "\n"),
+        ("\r\nTitle\r\n- Metadata\r\n\r\nContent\r\n", "\r\n"),
+    ],
+)
+def test_line_terminator(entry, newline):
+    assert scanner.line_terminator(entry) == newline
+    assert scanner.line_terminator(entry.encode("utf-8")) == newline
@@ -0,0 +1,112 @@
+import pytest
+
+from clippings.parser import Clipping
+from clippings.search import SearchIndex
+from clippings.search import main as search_main
+from clippings.search import parse_query
+from clippings.search import tokenize
+
+
+@pytest.fixture(name="index")
+def fixture_index(parsed_clippings):
+    return SearchIndex(parsed_clippings)
+
+
+def make_clipping(content):
+    return Clipping(None, None, content)
+
+
+def test_tokenize():
+    assert tokenize("Émile's CAFÉ, two-pizza ﬁle") == [
+        "emile",
+        "s",
+        "cafe",
+        "two",
+        "pizza",
+        "file",
+    ]
+
+
+def test_parse_query():
+    assert parse_query('team "Two Pizzas" x "single"') == (
+        ["team", "two", "pizzas", "x", "single"],
+        [["two", "pizzas"]],
+    )
+
+
+def test_search_terms(index, parsed_clippings):
+    results = index.search("priorities enemies")
+    assert sorted(parsed_clippings.index(clipping) for _, clipping in results) == [0, 2]
+    assert index.search("xylophone") == []
+    assert index.search("") == []
+
+
+def test_search_case_and_accents(index, parsed_clippings):
+    assert [clipping for _, clipping in index.search("PROUST")] == [parsed_clippings[3]]
+
+
+def test_search_ranking():
+    clippings = [
+        make_clipping("apple banana cherry"),
+        make_clipping("apple apple apple"),
+        make_clipping("banana"),
+    ]
+    results = SearchIndex(clippings).search("apple")
+    assert [clipping for _, clipping in results] == [clippings[1], clippings[0]]
+    assert results[0][0] > results[1][0] > 0
+
+    # Rare terms weigh more
+    results = SearchIndex(clippings).search("apple cherry")
+    assert results[0][1] is clippings[0]
+
+
+def test_search_phrase():
+    clippings = [
+        make_clipping("two pizza team"),
+        make_clipping("pizza for two"),
+        make_clipping("a team of two, pizza"),
+    ]
+    index = SearchIndex(clippings)
+    results = index.search('"two pizza"')
+    assert [clipping for _, clipping in results] == [clippings[0], clippings[2]]
+    assert index.search('"two pizza" "for two"') == []
+    assert index.search('"two unknown"') == []
+
+
+def test_search_limit(index):
+    assert len(index.search("the", limit=2)) == 2
+
+
+def test_save_load(index, tmp_path):
+    path = tmp_path / "index.pickle"
+    index.save(path)
+    loaded_index = SearchIndex.load(path)
+    assert loaded_index.search("enemies") == index.search("enemies")
+
+
+def test_main(capsys, clippings_file_path):
+    search_main(["enemies", clippings_file_path, "-o", "jsonl"])
+    assert capsys.readouterr().out.count("\n") == 1
+
+
+def test_main_index_file(capsys, tmp_path, clippings_file_path):
+    index_path = tmp_path / "index.pickle"
+    search_main(["enemies", clippings_file_path, "--index", str(index_path)])
+    output = capsys.readouterr().out
+    assert "Oscar Wilde" in output
+    assert index_path.exists()
+
+    # The saved index is reused...
+    SearchIndex([make_clipping("enemies")], source=SearchIndex.load(index_path).source).save(
+        index_path
+    )
+    search_main(["enemies", clippings_file_path, "--index", str(index_path)])
+    assert capsys.readouterr().out.startswith("None\n")
+
+    # ...unless it was built from another file
+    with open(clippings_file_path, "rb") as clippings_file:
+        content = clippings_file.read()
+    other_path = tmp_path / "clippings.txt"
+    other_path.write_bytes(content * 2)
+    search_main(["enemies", str(other_path), "--index", str(index_path)])
+    assert capsys.readouterr().out.count("Oscar Wilde") == 2
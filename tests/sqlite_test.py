@@ -0,0 +1,83 @@
+import sqlite3
+
+import pytest
+
+from clippings.sqlite import clipping_key
+from clippings.sqlite import main as sqlite_main
+from clippings.sqlite import write_sqlite
+
+
+@pytest.fixture(name="connection")
+def fixture_connection():
+    connection = sqlite3.connect(":memory:")
+    yield connection
+    connection.close()
+
+
+def test_clipping_key(parsed_clippings):
+    keys = {clipping_key(clipping) for clipping in parsed_clippings}
+    assert len(keys) == len(parsed_clippings)
+
+    clipping = parsed_clippings[0]
+    key = clipping_key(clipping)
+    clipping.content = "Edited content"
+    assert clipping_key(clipping) == key
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 1000])
+def test_write_sqlite(parsed_clippings, connection, batch_size):
+    assert write_sqlite(iter(parsed_clippings), connection, batch_size) == 5
+
+    assert connection.execute("SELECT COUNT(*) FROM documents").fetchone() == (4,)
+    rows = connection.execute(
+        "SELECT title, authors, category, location_begin, location_end, page, timestamp, content "
+        "FROM clippings JOIN documents ON documents.id = clippings.document_id "
+        "ORDER BY timestamp, location_begin"
+    ).fetchall()
+    assert rows[0] == (
+        "Java Concurrency in Practice",
+        "Joshua Bloch;Brian Goetz;Tim Peierls;Joseph Bowbeer;David Holmes;Doug Lea",
+        "Highlight",
+        4769,
+        4770,
+        311,
+        "2016-03-21T08:35:16",
+        parsed_clippings[0].content,
+    )
+    assert [row[3] for row in rows] == [4769, 1261, 1849, 20, 20]
+
+
+def test_write_sqlite_upsert(parsed_clippings, connection):
+    write_sqlite(parsed_clippings[:3], connection)
+    parsed_clippings[0].content = "Edited content"
+    write_sqlite(parsed_clippings, connection)
+
+    assert connection.execute("SELECT COUNT(*) FROM documents").fetchone() == (4,)
+    assert connection.execute("SELECT COUNT(*) FROM clippings").fetchone() == (5,)
+    assert connection.execute(
+        "SELECT content FROM clippings WHERE location_begin = 4769"
+    ).fetchone() == ("Edited content",)
+
+
+def test_write_sqlite_document_without_authors(parsed_clippings, connection):
+    parsed_clippings[0].document.authors = None
+    write_sqlite(parsed_clippings, connection)
+    write_sqlite(parsed_clippings, connection)
+
+    assert connection.execute("SELECT COUNT(*) FROM documents").fetchone() == (4,)
+
+
+def test_write_sqlite_indexes(parsed_clippings, connection):
+    write_sqlite(parsed_clippings, connection)
+    plan = connection.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM clippings WHERE category = 'Note'"
+    ).fetchall()
+    assert "clippings_category" in str(plan)
+
+
+def test_main(tmp_path, clippings_file_path):
+    database_path = tmp_path / "clippings.db"
+    sqlite_main([clippings_file_path, str(database_path)])
+
+    with sqlite3.connect(database_path) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM clippings").fetchone() == (5,)
@@ -0,0 +1,107 @@
+import os
+import subprocess
+import sys
+
+# Budget of the time spent importing modules when running the command line,
+# relative to the time a bare interpreter spends importing its own modules
+# (e.g. `site`), so that it doesn't depend on the speed of the machine. The
+# command line takes about 6 to 8 times the time of a bare interpreter, and
+# took 12 to 15 times when dateutil, json and the process pool were imported
+# eagerly.
+STARTUP_BUDGET = float(os.environ.get("CLIPPINGS_STARTUP_BUDGET", 10))
+STARTUP_RUNS = 5
+
+# Modules the parser only imports when they are needed
+LAZY_MODULES = [
+    "argparse",
+    "clippings.checkpoint",
+    "concurrent.futures",
+    "dateutil.parser",
+    "hashlib",
+    "json",
+    "pickle",
+]
+
+CLIPPINGS_FILE = os.path.join("tests", "resources", "clippings.txt")
+# Run the command line on the plain kindle output path
+CLI_CODE = (
+    "import os\n"
+    "import sys\n"
+    f"sys.argv = ['clippings', {CLIPPINGS_FILE!r}, '-o', 'kindle', '-w', os.devnull]\n"
+    "from clippings.parser import main\n"
+    "main()"
+)
+
+
+def run_python(code, *options):
+    """Run Python code in a new interpreter, and return the completed process."""
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def loaded_modules(code):
+    """Return the names of the modules among LAZY_MODULES loaded by some code."""
+    process = run_python(
+        f"import sys\n{code}\nprint(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    return process.stdout.split()
+
+
+def import_time_ms(code):
+    """Return the time spent importing modules when running some code, in
+    milliseconds, as reported by `python -X importtime`.
+    """
+    process = run_python(code, "-X", "importtime")
+    total = 0
+    for line in process.stderr.splitlines():
+        fields = line.split("|")
+        # Only count top-level imports, as their time includes nested ones
+        if len(fields) == 3 and fields[1].strip().isdigit() and fields[2][:3] != "   ":
+            total += int(fields[1])
+    return total / 1000
+
+
+def test_import_parser_is_lazy():
+    assert loaded_modules("import clippings.parser") == []
+
+
+def test_cli_is_lazy():
+    assert loaded_modules(CLI_CODE) == ["argparse"]
+
+
+def test_parse_known_timestamp_is_lazy():
+    code = (
+        "from clippings.timestamps import parse_timestamp\n"
+        "parse_timestamp('Sunday, 27 November 2016 16:01:02')"
+    )
+    assert "dateutil.parser" not in loaded_modules(code)
+
+
+def test_parse_unknown_timestamp_imports_dateutil():
+    code = "from clippings.timestamps import parse_timestamp\nparse_timestamp('2016-11-27 16:01')"
+    assert "dateutil.parser" in loaded_modules(code)
+
+
+def test_json_encoder_is_defined_on_first_use():
+    code = "import clippings.utils\nclippings.utils.DatetimeJSONEncoder"
+    assert loaded_modules(code) == ["json"]
+
+
+def test_unknown_attribute_of_utils():
+    import clippings.utils
+
+    assert not hasattr(clippings.utils, "DoesNotExist")
+
+
+def test_cli_startup_within_budget():
+    # Best of several runs, to smooth out the noise of a busy machine
+    bare = min(import_time_ms("pass") for _ in range(STARTUP_RUNS))
+    cli = min(import_time_ms(CLI_CODE) for _ in range(STARTUP_RUNS))
+    assert cli < STARTUP_BUDGET * bare, (
+        f"Running the command line spent {cli:.1f} ms importing modules, over the budget "
+        f"of {STARTUP_BUDGET} times the {bare:.1f} ms of a bare interpreter"
+    )
@@ -0,0 +1,93 @@
+import io
+
+import pytest
+
+from clippings.languages import parse_metadata
+from clippings.parser import iter_clippings
+from clippings.parser import parse_clippings
+from clippings.stats import STAGES
+from clippings.stats import ParseStats
+from clippings.stats import timed
+
+
+def test_parse_clippings_with_stats(clippings_bytes):
+    stats = ParseStats()
+    clippings = parse_clippings(io.BytesIO(clippings_bytes), stats=stats)
+
+    assert clippings == parse_clippings(io.BytesIO(clippings_bytes))
+    assert stats.entries == 5
+    assert stats.categories == {"Highlight": 4, "Note": 1}
+    # Separators, and the line break after the last one, aren't counted
+    assert stats.bytes == len(clippings_bytes) - 5 * len("==========") - 1
+    assert list(stats.stages) == list(STAGES)
+    for stage in ["split", "document", "metadata", "date"]:
+        assert stats.stages[stage] > 0
+    assert stats.stages["serialize"] == 0
+    assert stats.parse_time == pytest.approx(sum(stats.stages.values()))
+
+
+def test_stats_slowest(clippings_bytes):
+    stats = ParseStats(slowest=2)
+    clippings = parse_clippings(io.BytesIO(clippings_bytes), stats=stats)
+
+    assert len(stats.slowest) == 2
+    first, second = stats.slowest
+    assert first[0] >= second[0]
+    titles = [clipping.document.title for clipping in clippings]
+    for _, offset, title in stats.slowest:
+        assert title in titles
+        # The offset is that of the entry with the title (several can have it)
+        title_offset = clippings_bytes.index(title.encode("utf-8"), offset)
+        assert b"==========" not in clippings_bytes[offset:title_offset]
+
+
+def test_stats_no_slowest(clippings_bytes):
+    stats = ParseStats(slowest=0)
+    parse_clippings(io.BytesIO(clippings_bytes), stats=stats)
+    assert stats.slowest == []
+    assert stats.entries == 5
+
+
+def test_stats_text_file(clippings_bytes):
+    stats = ParseStats()
+    list(iter_clippings(io.StringIO(clippings_bytes.decode("utf-8")), stats=stats))
+    assert stats.entries == 5
+
+
+def test_stats_other_metadata_parser(clippings_bytes):
+    stats = ParseStats()
+    parse_clippings(io.BytesIO(clippings_bytes), metadata_parser=parse_metadata, stats=stats)
+    assert stats.stages["date"] > 0
+
+
+def test_stats_accumulate(clippings_bytes):
+    stats = ParseStats()
+    parse_clippings(io.BytesIO(clippings_bytes), stats=stats)
+    parse_clippings(io.BytesIO(clippings_bytes), stats=stats)
+    assert stats.categories == {"Highlight": 8, "Note": 2}
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"lazy": True}, {"workers": 2}],
+)
+def test_stats_invalid_options(clippings_bytes, kwargs):
+    with pytest.raises(ValueError):
+        parse_clippings(io.BytesIO(clippings_bytes), stats=ParseStats(), **kwargs)
+
+
+def test_timed_without_stats():
+    assert timed("date", int, "42") == 42
+
+
+def test_summary(clippings_bytes):
+    stats = ParseStats()
+    parse_clippings(io.BytesIO(clippings_bytes), stats=stats)
+    summary = stats.summary()
+    assert summary.startswith("Parsed 5 entries")
+    assert "Categories: Highlight: 4, Note: 1" in summary
+    assert "Slowest entries:" in summary
+
+
+def test_summary_empty():
+    assert "Categories: -" in ParseStats().summary()
@@ -0,0 +1,41 @@
+import io
+
+from benchmarks.synthetic import CATEGORIES
+from benchmarks.synthetic import generate_clippings
+from clippings.languages import parse_metadata
+from clippings.parser import parse_clippings
+from clippings.scanner import BOM
+
+COUNT = 200
+
+
+def parse(text, **kwargs):
+    return parse_clippings(io.BytesIO(text.encode("utf-8")), **kwargs)
+
+
+def test_generate_clippings_is_deterministic():
+    assert generate_clippings(COUNT, seed=1) == generate_clippings(COUNT, seed=1)
+    assert generate_clippings(COUNT, seed=1) != generate_clippings(COUNT, seed=2)
+
+
+def test_generate_clippings_english():
+    text = generate_clippings(COUNT)
+    assert BOM in text
+    assert "\r\n" not in text
+
+    clippings = parse(text)
+    assert len(clippings) == COUNT
+    assert {clipping.metadata.category for clipping in clippings} == set(CATEGORIES)
+
+
+def test_generate_clippings_multilingual_crlf():
+    text = generate_clippings(COUNT, crlf=True, languages=("en", "es"))
+    assert text.count("\r\n") == text.count("\n")
+    assert "Added on" in text
+    assert "Añadido el" in text
+
+    clippings = parse(text, metadata_parser=parse_metadata)
+    assert len(clippings) == COUNT
+    assert {clipping.metadata.category for clipping in clippings} == set(CATEGORIES)
+    # Content is split on line breaks, so no carriage return is left behind
+    assert not any("\r" in clipping.content for clipping in clippings)
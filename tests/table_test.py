@@ -0,0 +1,92 @@
+import datetime
+
+import pytest
+
+from clippings.parser import Document
+from clippings.table import NO_PAGE
+from clippings.table import ClippingTable
+
+
+@pytest.fixture(name="table")
+def fixture_table(clippings_file_path):
+    with open(clippings_file_path, "rb") as clippings_file:
+        return ClippingTable.from_file(clippings_file)
+
+
+def test_from_file(table, parsed_clippings):
+    assert len(table) == len(parsed_clippings)
+    assert list(table) == parsed_clippings
+
+
+def test_from_clippings(table, parsed_clippings):
+    other_table = ClippingTable.from_clippings(parsed_clippings)
+    assert list(other_table) == list(table)
+
+
+def test_columns(table):
+    assert len(table.documents) == 4
+    assert table.categories == ["Highlight", "Note"]
+    assert list(table.document_ids) == [0, 1, 2, 3, 3]
+    assert list(table.category_ids) == [0, 0, 0, 1, 0]
+    assert list(table.location_begins) == [4769, 1261, 1849, 20, 20]
+    assert list(table.location_ends) == [4770, 1265, 1849, 20, 20]
+    assert list(table.pages) == [311, 95, NO_PAGE, NO_PAGE, NO_PAGE]
+    assert table.timestamps[0] == 1458549316  # 2016-03-21T08:35:16Z
+
+
+def test_getitem(table, parsed_clippings):
+    assert table[0] == parsed_clippings[0]
+    assert table[-1] == parsed_clippings[-1]
+    with pytest.raises(IndexError):
+        table[len(parsed_clippings)]
+
+
+def test_slice(table, parsed_clippings):
+    assert list(table[1:3]) == parsed_clippings[1:3]
+    assert list(table[::-1]) == parsed_clippings[::-1]
+
+
+def test_filter(table, parsed_clippings):
+    document = Document(
+        "The Essays of Arthur Schopenhauer: the Wisdom of Life", "Schopenhauer, Arthur"
+    )
+    assert list(table.filter(document=document)) == parsed_clippings[3:]
+    assert list(table.filter(document=Document("Unknown"))) == []
+    assert list(table.filter(category="Note")) == [parsed_clippings[3]]
+    assert list(table.filter(document=document, category="Highlight")) == [parsed_clippings[4]]
+
+
+def test_filter_time_range(table, parsed_clippings):
+    since = datetime.datetime(2016, 7, 14, 23, 35, 52)
+    until = datetime.datetime(2016, 9, 13, 7, 29, 9)
+    assert list(table.filter(since=since)) == parsed_clippings[1:]
+    assert list(table.filter(since=since, until=until)) == parsed_clippings[1:3]
+
+
+def test_sort(table, parsed_clippings):
+    by_location = [parsed_clippings[index] for index in [3, 4, 1, 2, 0]]
+    assert list(table.sort("location")) == by_location
+    assert list(table.sort("location", reverse=True)) == [
+        parsed_clippings[index] for index in [0, 2, 1, 3, 4]
+    ]
+    assert list(table.sort(("category", "location"))) == [
+        parsed_clippings[index] for index in [4, 1, 2, 0, 3]
+    ]
+
+
+def test_derived_table_append(table, parsed_clippings):
+    other_table = table[:1]
+    other_table.append(parsed_clippings[4])
+    assert list(other_table) == [parsed_clippings[0], parsed_clippings[4]]
+    assert len(table.documents) == 4
+
+
+def test_to_numpy(table):
+    numpy = pytest.importorskip("numpy")
+    arrays = table.to_numpy()
+
+    assert arrays["location_begins"].tolist() == list(table.location_begins)
+    assert arrays["timestamps"][0] == numpy.datetime64("2016-03-21T08:35:16")
+    # Views share memory with the columns
+    assert numpy.shares_memory(arrays["pages"], numpy.frombuffer(table.pages, dtype=numpy.intc))
+    assert numpy.sort(arrays["location_begins"]).tolist() == [20, 20, 1261, 1849, 4769]
@@ -0,0 +1,60 @@
+import datetime
+from unittest import mock
+
+import dateutil.parser
+import pytest
+
+from clippings.timestamps import parse_timestamp
+
+
+@pytest.mark.parametrize(
+    "string, expected",
+    [
+        ("Friday, May 13, 2016 11:23:26 PM", datetime.datetime(2016, 5, 13, 23, 23, 26)),
+        ("Tuesday, September 13, 2016 7:29:09 AM", datetime.datetime(2016, 9, 13, 7, 29, 9)),
+        ("Tuesday, September 13, 2016 12:29:09 AM", datetime.datetime(2016, 9, 13, 0, 29, 9)),
+        ("Tuesday, September 13, 2016 12:29:09 PM", datetime.datetime(2016, 9, 13, 12, 29, 9)),
+        ("Friday, May 13, 2016 23:23:26", datetime.datetime(2016, 5, 13, 23, 23, 26)),
+        ("Wednesday, 6 July 2022 06:54:57", datetime.datetime(2022, 7, 6, 6, 54, 57)),
+        ("Wednesday, 6 July 2022 6:54:57 PM", datetime.datetime(2022, 7, 6, 18, 54, 57)),
+        # Inconsistent weekdays are tolerated, like dateutil does
+        ("Thursday, September 13, 2016 7:29:09 AM", datetime.datetime(2016, 9, 13, 7, 29, 9)),
+    ],
+)
+def test_parse_timestamp_known_formats(string, expected):
+    with mock.patch("dateutil.parser.parse") as dateutil_parse_mock:
+        assert parse_timestamp(string) == expected
+
+    dateutil_parse_mock.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "string",
+    [
+        "Friday, May 13, 2016 23:23:26",
+        "Friday, May 13, 2016 11:23:26 PM",
+        "Wednesday, 6 July 2022 06:54:57",
+    ],
+)
+def test_parse_timestamp_agrees_with_dateutil(string):
+    assert parse_timestamp(string) == dateutil.parser.parse(string)
+
+
+@pytest.mark.parametrize(
+    "string",
+    [
+        "2016-05-13T23:23:26",
+        "Friday, Mai 13, 2016 11:23:26 PM",
+        "Friday, May 13, 2016 13:23:26 PM",
+    ],
+)
+def test_parse_timestamp_falls_back_to_dateutil(string):
+    with mock.patch("dateutil.parser.parse", return_value="fallback") as dateutil_parse_mock:
+        assert parse_timestamp(string) == "fallback"
+
+    dateutil_parse_mock.assert_called_once_with(string)
+
+
+def test_parse_timestamp_invalid():
+    with pytest.raises(ValueError):
+        parse_timestamp("Not a timestamp")
@@ -3,7 +3,9 @@ import json
 
 import pytest
 
+from clippings.utils import BasicEqualityMixin
 from clippings.utils import DatetimeJSONEncoder
+from clippings.utils import parser_identity
 
 DATE = datetime.datetime(2016, 1, 2, 3, 4, 5)
 DATE_STRING = "2016-01-02T03:04:05"
@@ -21,3 +23,75 @@ def test_datetime_encoder_typeerror():
     # Ensure we let the parent raise TypeError
     with pytest.raises(TypeError):
         json.dumps(undumpable_dictionary, cls=DatetimeJSONEncoder)
+
+
+class Point(BasicEqualityMixin):
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class NamedPoint(Point):
+    pass
+
+
+class OtherPoint(BasicEqualityMixin):
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def test_equality_subclass():
+    assert Point(1, 2) == NamedPoint(1, 2)
+    assert NamedPoint(1, 2) == Point(1, 2)
+    assert Point(1, 2) != NamedPoint(1, 3)
+
+
+def test_equality_unrelated_classes():
+    assert Point(1, 2) != OtherPoint(1, 2)
+    assert OtherPoint(1, 2) != Point(1, 2)
+    assert Point(1, 2) != object()
+
+
+class CachedPoint(BasicEqualityMixin):
+    __slots__ = ("x", "y", "_norm")
+
+    def __init__(self, x, y, norm=None):
+        self.x = x
+        self.y = y
+        self._norm = norm
+
+
+def test_equality_ignores_private_slots():
+    assert CachedPoint(3, 4, 5) == CachedPoint(3, 4)
+    assert hash(CachedPoint(3, 4, 5)) == hash(CachedPoint(3, 4))
+    assert CachedPoint(3, 4, 5) != CachedPoint(3, 5, 5)
+
+
+class LabelledPoint(CachedPoint):
+    __slots__ = ("label",)
+
+    def __init__(self, x, y, label):
+        super().__init__(x, y)
+        self.label = label
+
+
+class EmptySlotsPoint(CachedPoint):
+    __slots__ = ()
+
+
+def test_equality_inherited_slots():
+    assert LabelledPoint(1, 2, "a") != LabelledPoint(3, 4, "a")
+    assert LabelledPoint(1, 2, "a") != LabelledPoint(1, 2, "b")
+    assert LabelledPoint(1, 2, "a") == LabelledPoint(1, 2, "a")
+    assert hash(LabelledPoint(1, 2, "a")) == hash(LabelledPoint(1, 2, "a"))
+
+
+def test_equality_subclass_without_slots():
+    assert EmptySlotsPoint(1, 2) != EmptySlotsPoint(3, 4)
+    assert EmptySlotsPoint(1, 2) == CachedPoint(1, 2)
+
+
+def test_parser_identity():
+    assert parser_identity(test_parser_identity) == "tests.utils_test.test_parser_identity"
+    assert parser_identity(Point.__eq__) == "clippings.utils.BasicEqualityMixin.__eq__"